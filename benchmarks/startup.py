@@ -0,0 +1,146 @@
+#! /usr/bin/python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark of the startup time of the Z2n Software.
+
+Times the import of the command line interface, the help message and a
+short run from the terminal, with an empty and with a warm cache of the
+compiled kernels, and lists the heavy libraries the help message imports.
+
+    python benchmarks/startup.py --repeat 5
+"""
+
+# Generic/Built-in
+import os
+import sys
+import time
+import pathlib
+import tempfile
+import subprocess
+
+# Other Libraries
+import click
+import numpy as np
+from astropy.io import fits
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+CLI = 'import sys; from z2n.prompt import z2n; sys.argv[0] = "z2n"; z2n()'
+HEAVY = ('astropy', 'h5py', 'matplotlib', 'psutil', 'scipy.stats',
+         'termtables', 'tqdm')
+PROBE = (
+    'import sys, atexit; from z2n.main import cli; '
+    f'atexit.register(lambda: print(*[name for name in {HEAVY!r} '
+    'if name in sys.modules], file=sys.stderr)); '
+    'sys.argv[:] = ["z2n", "--help"]; cli()')
+
+
+def events(path: pathlib.Path, size: int) -> None:
+    """
+    Write a pulsed time series on a FITS file.
+
+    Parameters
+    ----------
+    path : pathlib.Path
+        A path that represents the events file.
+    size : int
+        An integer that represents the number of photon arrival times.
+
+    Returns
+    -------
+    None
+    """
+    rng = np.random.default_rng(0)
+    times = np.sort(rng.uniform(0, 1000, size))
+    times += 0.01 * np.sin(2 * np.pi * 0.5 * times)
+    column = fits.Column(name='TIME', array=times, format='D')
+    table = fits.BinTableHDU.from_columns([column])
+    fits.HDUList([fits.PrimaryHDU(), table]).writeto(path, overwrite=True)
+
+
+def loaded(env: dict) -> list:
+    """
+    List the heavy libraries imported by the help message of the entry point.
+
+    Parameters
+    ----------
+    env : dict
+        A dictionary that represents the environment variables.
+
+    Returns
+    -------
+    names : list
+        A list that represents the names of the libraries imported.
+    """
+    result = subprocess.run(
+        [sys.executable, '-c', PROBE], env=env, cwd=ROOT, check=True,
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    return result.stderr.split()
+
+
+def measure(args: list, env: dict) -> float:
+    """
+    Measure the wall time of a new interpreter.
+
+    Parameters
+    ----------
+    args : list
+        A list that represents the arguments of the interpreter.
+    env : dict
+        A dictionary that represents the environment variables.
+
+    Returns
+    -------
+    elapsed : float
+        A float that represents the wall time (s).
+    """
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, *args], env=env, cwd=ROOT, check=True,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+
+@click.command()
+@click.option('--repeat', type=int, default=3, show_default=True,
+              help='Repetitions of each measurement.')
+@click.option('--size', type=int, default=10000, show_default=True,
+              help='Number of photon arrival times of the run.')
+def startup(repeat, size) -> None:
+    """Benchmark the startup time of the Z2n Software."""
+    with tempfile.TemporaryDirectory() as folder:
+        folder = pathlib.Path(folder)
+        events(folder / 'events.fits', size)
+        env = dict(os.environ, NUMBA_CACHE_DIR=str(folder / 'cache'),
+                   MPLBACKEND='agg')
+        run = [
+            '-c', CLI, '--input', str(folder / 'events.fits'),
+            '--output', str(folder / 'periodogram'), '--fmin', '0.1',
+            '--fmax', '1', '--delta', '0.001', '--format', 'csv',
+            '--image', 'png']
+        cases = (
+            ('import', ['-c', 'import z2n.prompt'], False),
+            ('help', ['-c', CLI, '--help'], False),
+            ('run (cold cache)', run, True),
+            ('run (warm cache)', run, False),
+        )
+        for name, args, cold in cases:
+            elapsed = []
+            for _ in range(repeat):
+                for output in folder.glob('periodogram.*'):
+                    output.unlink()
+                if cold:
+                    for cached in folder.glob('cache/**/*.nb*'):
+                        cached.unlink()
+                elapsed.append(measure(args, env))
+            click.secho(
+                f"{name:<18} best {min(elapsed):.3f} s, "
+                f"median {np.median(elapsed):.3f} s", fg='cyan')
+        names = loaded(env)
+        click.secho(
+            f"{'help imports':<18} {', '.join(names) if names else 'none'}",
+            fg='yellow' if names else 'cyan')
+
+
+if __name__ == "__main__":
+    startup()
@@ -10,7 +10,7 @@ with open("README.md", "r") as fh:
         name='z2n-periodogram',
         version='2.0.6',
         license='MIT',
-        python_requires='>=3.6.9',
+        python_requires='>=3.8',
         install_requires=[
             'intel-openmp',
             'click',
@@ -37,6 +37,9 @@ with open("README.md", "r") as fh:
                 "mkautodoc",
                 "markdown-katex",
             ],
+            "nufft": [
+                "finufft",
+            ],
         },
         entry_points='''
             [console_scripts]
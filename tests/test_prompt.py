@@ -0,0 +1,29 @@
+#! /usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Other libraries
+import numpy as np
+from click.testing import CliRunner
+
+# Owned Libraries
+from z2n import prompt
+
+
+def test_stream_ascii_output(tmp_path, monkeypatch):
+    """Check that a streamed ascii periodogram is saved where it is reported."""
+    monkeypatch.setenv('HOME', str(tmp_path))
+    monkeypatch.chdir(tmp_path)
+    times = np.sort(np.random.default_rng(0).uniform(0, 1e3, 200))
+    np.savetxt('events.csv', times, header='TIME', comments='')
+    (tmp_path / 'out.txt').write_text('kept\n')
+    result = CliRunner().invoke(prompt.z2n, [
+        '--input', 'events.csv', '--fmin', '1', '--fmax', '2',
+        '--delta', '0.01', '--stream', '--format', 'ascii',
+        '--output', 'out'], input='new\n')
+    assert result.exit_code == 0, result.output
+    assert "File already exists." in result.output
+    assert "File saved at new.txt" in result.output
+    assert (tmp_path / 'out.txt').read_text() == 'kept\n'
+    lines = (tmp_path / 'new.txt').read_text().splitlines()
+    assert lines[0] == 'FREQUENCY POWER'
+    assert len(lines) == 101
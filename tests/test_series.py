@@ -0,0 +1,32 @@
+#! /usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Other libraries
+import numpy as np
+
+# Owned Libraries
+from z2n.series import Series
+from z2n.grid import arange
+
+
+def test_reduced_periodogram_without_full_spectrum(monkeypatch):
+    """Check that a reduced search never allocates the whole periodogram."""
+    series = Series()
+    series.time = np.sort(np.random.default_rng(0).uniform(0, 1e3, 200))
+    series.harmonics = 1
+    series.fmin, series.fmax, series.delta = 1, 2, 1e-5
+    series.bins = arange(series.fmin, series.fmax, series.delta)
+    series.search = 'reduced'
+    series.peaks = 5
+    total = series.bins.size
+    sizes = []
+    zeros = np.zeros
+
+    def spy(shape, *args, **kwargs):
+        sizes.append(int(np.prod(shape)))
+        return zeros(shape, *args, **kwargs)
+
+    monkeypatch.setattr(np, 'zeros', spy)
+    series.set_periodogram()
+    assert sizes and max(sizes) < total
+    assert series.z2n.size == series.bins.size == 5
@@ -0,0 +1,352 @@
+#! /usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Generic/Built-in
+import csv
+import glob
+import json
+import time
+import pathlib
+import itertools
+import collections
+from concurrent import futures
+
+# Other Libraries
+import click
+import numpy as np
+
+# Owned Libraries
+from z2n import file
+from z2n import stats
+from z2n.grid import arange
+from z2n.series import Series
+
+FIELDS = {
+    'input': str, 'output': str, 'ext': int, 'fmin': float, 'fmax': float,
+    'delta': float, 'over': int, 'harm': int, 'method': str,
+    'precision': str, 'tol': float, 'binning': float, 'format': str,
+}
+
+SUMMARY = (
+    'input', 'output', 'events', 'exposure', 'steps', 'power', 'frequency',
+    'period', 'pulsed', 'seconds', 'status')
+
+
+def manifest(path: str) -> list:
+    """
+    Read the jobs of a manifest file.
+
+    The manifest is a csv file with an input column, and optional columns
+    with the parameters of each file. Empty values use the shared ones.
+
+    Parameters
+    ----------
+    path : str
+        A string that represents the manifest path.
+
+    Returns
+    -------
+    specs : list
+        A list with a dictionary for each job.
+    """
+    specs = []
+    folder = pathlib.Path(path).resolve().parent
+    with open(path, newline='') as handle:
+        for row in csv.DictReader(handle):
+            spec = {
+                key: FIELDS[key](value.strip()) for key, value in row.items()
+                if key in FIELDS and value and value.strip()}
+            if 'input' in spec:
+                spec['input'] = str(folder / spec['input'])
+                specs.append(spec)
+    return specs
+
+
+def specs(inputs: tuple, path: str, shared: dict) -> list:
+    """
+    Combine the input files and the manifest with the shared parameters.
+
+    Parameters
+    ----------
+    inputs : tuple
+        A tuple with the input files or glob patterns.
+    path : str
+        A string that represents the manifest path.
+    shared : dict
+        A dictionary with the parameters shared by every job.
+
+    Returns
+    -------
+    specs : list
+        A list with a dictionary for each job.
+    """
+    jobs = []
+    for pattern in inputs:
+        for name in sorted(glob.glob(pattern)) or [pattern]:
+            jobs.append({'input': name})
+    if path:
+        jobs.extend(manifest(path))
+    shared = {key: value for key, value in shared.items() if value is not None}
+    return [{**shared, **spec} for spec in jobs]
+
+
+def target(spec: dict) -> str:
+    """
+    Return the output file of a job.
+
+    Parameters
+    ----------
+    spec : dict
+        A dictionary that represents the job.
+
+    Returns
+    -------
+    path : str
+        A string that represents the resolved output file path.
+    """
+    suffix = spec.get('format', 'fits')
+    suffix = "txt" if suffix == 'ascii' else suffix
+    return str(pathlib.Path(f"{spec['output']}.{suffix}").resolve())
+
+
+def outputs(jobs: list, folder: str) -> None:
+    """
+    Name the output files of the jobs without one.
+
+    The output is named after the input file, and the job number is added
+    when another job would write the same file, as for inputs that only
+    differ on the suffix or on the folder.
+
+    Parameters
+    ----------
+    jobs : list
+        A list with a dictionary for each job.
+    folder : str
+        A string that represents the folder of the output files.
+
+    Returns
+    -------
+    None
+    """
+    named = []
+    for number, spec in enumerate(jobs, 1):
+        if not spec.get('output'):
+            spec['output'] = str(
+                pathlib.Path(folder) / ("z2n_" + pathlib.Path(spec['input']).stem))
+            named.append((number, spec))
+    counts = collections.Counter(target(spec) for spec in jobs)
+    for number, spec in named:
+        if counts[target(spec)] > 1:
+            spec['output'] = f"{spec['output']}_{number}"
+
+
+def clashes(jobs: list) -> list:
+    """
+    Find the output files written by more than one job.
+
+    Parameters
+    ----------
+    jobs : list
+        A list with a dictionary for each job.
+
+    Returns
+    -------
+    paths : list
+        A list with the output files shared by jobs.
+    """
+    counts = collections.Counter(target(spec) for spec in jobs)
+    return [path for path, count in counts.items() if count > 1]
+
+
+def check(spec: dict) -> str:
+    """
+    Check the parameters of a job.
+
+    Parameters
+    ----------
+    spec : dict
+        A dictionary that represents the job.
+
+    Returns
+    -------
+    error : str
+        A string that represents the missing parameter, empty if none.
+    """
+    if not spec.get('input') or not pathlib.Path(spec['input']).is_file():
+        return f"Input file {spec.get('input')} not found."
+    if not spec.get('fmax'):
+        return "The maximum frequency is needed."
+    if not spec.get('delta') and not spec.get('over'):
+        return "The frequency steps are needed."
+    return ""
+
+
+def prepare(spec: dict, cache: collections.OrderedDict = None,
+            entries: int = 0) -> tuple:
+    """
+    Load the time series of a job without asking for anything.
+
+    Parameters
+    ----------
+    spec : dict
+        A dictionary that represents the job.
+    cache : OrderedDict
+        A dictionary with the time series of the last event files.
+    entries : int
+        An integer that represents the number of event files kept.
+
+    Returns
+    -------
+    series : Series
+        A time series object, or None if it was not loaded.
+    error : str
+        A string that represents the failure, empty if none.
+    """
+    error = check(spec)
+    if error:
+        return None, error
+    series = Series()
+    series.input = spec['input']
+    series.harmonics = int(spec.get('harm', 1))
+    series.method = spec.get('method', 'direct')
+    series.precision = spec.get('precision', 'double')
+    series.tolerance = float(spec.get('tol', 1e-9))
+    series.binning = float(spec.get('binning') or 0)
+    series.filters = {
+        column: tuple(bounds) for column, bounds in spec.get('filters', {}).items()}
+    series.gti = bool(spec.get('gti', False))
+    series.format = spec.get('format', 'fits')
+    series.output = spec.get('output') or "z2n_" + pathlib.Path(series.input).stem
+    if pathlib.Path(file.filename(series)).is_file():
+        return None, f"File {file.filename(series)} already exists."
+    path = pathlib.Path(series.input).resolve()
+    key = (str(path), spec.get('ext', 1), path.stat().st_mtime_ns,
+           json.dumps(spec.get('filters', {}), sort_keys=True),
+           bool(spec.get('gti', False)))
+    if cache is not None and key in cache:
+        cache.move_to_end(key)
+        series.time = cache[key]
+        return series, ""
+    if file.load_events(series, spec.get('ext', 1), interactive=False):
+        return None, f"Events not found on {series.input}."
+    if cache is not None and entries:
+        cache[key] = series.time
+        while len(cache) > entries:
+            cache.popitem(last=False)
+    return series, ""
+
+
+def compute(series, spec: dict, workers: int = 1) -> dict:
+    """
+    Calculate the periodogram of a loaded job and save it on a file.
+
+    Parameters
+    ----------
+    series : Series
+        A time series object.
+    spec : dict
+        A dictionary that represents the job.
+    workers : int
+        An integer that represents the number of worker processes.
+
+    Returns
+    -------
+    result : dict
+        A dictionary with the output file and the peak values.
+    """
+    start = time.perf_counter()
+    series.workers = workers
+    series.set_exposure()
+    series.set_sampling()
+    series.set_nyquist()
+    series.fmin = float(spec.get('fmin') or series.nyquist)
+    series.fmax = float(spec['fmax'])
+    if spec.get('over'):
+        series.oversample = int(spec['over'])
+        series.delta = 1 / (series.oversample * series.exposure)
+    else:
+        series.delta = float(spec['delta'])
+    series.bins = arange(series.fmin, series.fmax, series.delta)
+    series.z2n = np.zeros(series.bins.size)
+    stats.periodogram(series)
+    series.set_power()
+    series.set_frequency()
+    series.set_period()
+    series.set_pfraction()
+    if series.format == 'ascii':
+        file.save_ascii(series)
+    elif series.format == 'csv':
+        file.save_csv(series)
+    elif series.format == 'fits':
+        file.save_fits(series)
+    elif series.format == 'hdf5':
+        file.save_hdf5(series)
+    return {
+        'input': series.input,
+        'output': file.filename(series),
+        'events': int(series.time.size),
+        'exposure': float(series.exposure),
+        'steps': int(series.bins.size),
+        'power': float(series.power),
+        'frequency': float(series.frequency),
+        'period': float(series.period),
+        'pulsed': float(series.pulsed),
+        'seconds': time.perf_counter() - start,
+        'status': 'done',
+    }
+
+
+def run(jobs: list, summary: str, threads: int = 4, workers: int = 1) -> int:
+    """
+    Calculate the periodograms of many jobs and write a summary of the peaks.
+
+    The event files are loaded by a pool of threads, a few jobs ahead of
+    the periodogram being calculated, so reading the next files overlaps
+    with the computation of the current one.
+
+    Parameters
+    ----------
+    jobs : list
+        A list with a dictionary for each job.
+    summary : str
+        A string that represents the summary file path.
+    threads : int
+        An integer that represents the number of loading threads.
+    workers : int
+        An integer that represents the number of worker processes.
+
+    Returns
+    -------
+    failed : int
+        An integer that represents the number of failed jobs.
+    """
+    failed = 0
+    queue = iter(jobs)
+    pending = collections.deque()
+    with futures.ThreadPoolExecutor(max(threads, 1)) as pool, \
+            open(summary, 'w', newline='') as handle:
+        writer = csv.DictWriter(handle, SUMMARY, extrasaction='ignore')
+        writer.writeheader()
+        for spec in itertools.islice(queue, max(threads, 1)):
+            pending.append((spec, pool.submit(prepare, spec)))
+        while pending:
+            spec, future = pending.popleft()
+            following = next(queue, None)
+            if following is not None:
+                pending.append((following, pool.submit(prepare, following)))
+            click.secho(f"\nJob {spec.get('input')}", fg='yellow')
+            try:
+                series, error = future.result()
+                result = compute(series, spec, workers) if series else {
+                    'input': spec.get('input'), 'status': error}
+            except Exception as exception:
+                result = {'input': spec.get('input'),
+                          'status': f"{type(exception).__name__}: {exception}"}
+            if result['status'] == 'done':
+                click.secho(f"File saved at {result['output']}", fg='green')
+            else:
+                failed += 1
+                click.secho(result['status'], fg='red')
+            writer.writerow(result)
+            handle.flush()
+    return failed
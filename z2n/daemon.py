@@ -0,0 +1,174 @@
+#! /usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Generic/Built-in
+import os
+import json
+import socket
+import pathlib
+import collections
+import socketserver
+
+# Other Libraries
+import click
+import numpy as np
+
+# Owned Libraries
+from z2n import batch
+from z2n import stats
+from z2n.grid import arange
+from z2n.series import Series
+
+SOCKET = f'{pathlib.Path.home()}/.z2n.sock'
+
+
+def warm(methods: tuple = ('direct', 'stepping', 'fft')) -> None:
+    """
+    Compile the kernels on a small periodogram.
+
+    Parameters
+    ----------
+    methods : tuple
+        A tuple that represents the methods of the periodogram.
+
+    Returns
+    -------
+    None
+    """
+    series = Series()
+    series.time = np.linspace(0, 100, 1000)
+    series.harmonics = 1
+    series.delta = 0.01
+    for method in methods:
+        series.method = method
+        series.bins = arange(1, 2, series.delta)
+        series.z2n = np.zeros(series.bins.size)
+        stats.periodogram(series)
+
+
+def job(spec: dict, cache: collections.OrderedDict, entries: int = 0,
+        workers: int = 1) -> dict:
+    """
+    Calculate the periodogram of a job and save it on a file.
+
+    Parameters
+    ----------
+    spec : dict
+        A dictionary that represents the job.
+    cache : OrderedDict
+        A dictionary with the time series of the last event files.
+    entries : int
+        An integer that represents the number of event files kept.
+    workers : int
+        An integer that represents the number of worker processes.
+
+    Returns
+    -------
+    result : dict
+        A dictionary with the output file and the peak values.
+    """
+    series, error = batch.prepare(spec, cache, entries)
+    if error:
+        return {'error': error}
+    return batch.compute(series, spec, workers)
+
+
+class Handler(socketserver.StreamRequestHandler):
+    """
+    A class to handle the jobs sent to the daemon.
+
+    Each connection sends a single job as a line of JSON, and receives the
+    result as a line of JSON.
+
+    Methods
+    -------
+    """
+
+    def handle(self) -> None:
+        try:
+            spec = json.loads(self.rfile.readline())
+            if spec.get('action') == 'stop':
+                self.server.running = False
+                result = {'stopped': True}
+            else:
+                click.secho(f"Job {spec.get('input')}", fg='yellow')
+                result = job(spec, self.server.cache, self.server.entries,
+                             self.server.workers)
+        except Exception as error:
+            result = {'error': f"{type(error).__name__}: {error}"}
+        if 'error' in result:
+            click.secho(result['error'], fg='red')
+        elif 'output' in result:
+            click.secho(f"File saved at {result['output']}", fg='green')
+        self.wfile.write(json.dumps(result).encode() + b'\n')
+
+
+def serve(path: str = SOCKET, entries: int = 0, workers: int = 1) -> int:
+    """
+    Serve the periodogram jobs sent over a Unix domain socket.
+
+    Parameters
+    ----------
+    path : str
+        A string that represents the socket path.
+    entries : int
+        An integer that represents the number of event files kept.
+    workers : int
+        An integer that represents the number of worker processes.
+
+    Returns
+    -------
+    flag : int
+        An integer that represents a daemon already running on the socket.
+    """
+    if pathlib.Path(path).exists():
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+                client.connect(path)
+            click.secho(f"Daemon already running on {path}", fg='red')
+            return 1
+        except OSError:
+            os.unlink(path)
+    click.secho("Compiling the kernels.", fg='yellow')
+    warm()
+    with socketserver.UnixStreamServer(path, Handler) as server:
+        server.cache = collections.OrderedDict()
+        server.entries = entries
+        server.workers = workers
+        server.running = True
+        click.secho(f"Serving jobs on {path}", fg='green')
+        try:
+            while server.running:
+                server.handle_request()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            os.unlink(path)
+    click.secho("Daemon stopped.", fg='yellow')
+    return 0
+
+
+def submit(spec: dict, path: str = SOCKET) -> dict:
+    """
+    Send a job to the daemon and wait for the result.
+
+    Parameters
+    ----------
+    spec : dict
+        A dictionary that represents the job.
+    path : str
+        A string that represents the socket path.
+
+    Returns
+    -------
+    result : dict
+        A dictionary with the output file and the peak values.
+    """
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.connect(path)
+            client.sendall(json.dumps(spec).encode() + b'\n')
+            with client.makefile('rb') as reply:
+                return json.loads(reply.readline())
+    except OSError:
+        return {'error': f"No daemon running on {path}"}
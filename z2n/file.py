@@ -2,13 +2,24 @@
 # -*- coding: utf-8 -*-
 
 # Generic/Built-in
+import io
+import os
+import json
 import pathlib
+import functools
+import collections
+from concurrent import futures
 
 # Other Libraries
 import click
 import numpy as np
-from astropy.io import fits
-from astropy.table import Table
+
+# Owned Libraries
+from z2n import lazy
+
+h5py = lazy.module('h5py')
+fits = lazy.module('astropy.io.fits')
+tables = lazy.module('astropy.table')
 
 
 def load_file(series, ext) -> int:
@@ -33,52 +44,179 @@ def load_file(series, ext) -> int:
     elif suffix in (".hdf", ".h5", ".hdf5", ".he5"):
         flag = load_hdf5(series)
     else:
-        with fits.open(series.input) as events:
-            try:
-                events['Z2N']
-                click.secho('Z2N extension already found', fg='yellow')
-                if click.confirm('Use the periodogram', prompt_suffix='? '):
-                    series.bins = events['Z2N'].data['FREQUENCY']
-                    series.bins = series.bins.astype(series.bins.dtype.name)
-                    series.z2n = events['Z2N'].data['POWER']
-                    series.z2n = series.z2n.astype(series.z2n.dtype.name)
-                    hdr = events['Z2N'].header
-                    series.exposure = float(hdr['exposure'])
-                    series.sampling = float(hdr['sampling'])
-                    series.nyquist = float(hdr['nyquist'])
-                    series.harmonics = int(hdr['harmonic'])
-                    series.fmin = float(hdr['fmin'])
-                    series.fmax = float(hdr['fmax'])
-                    series.delta = float(hdr['delta'])
-                    series.frequency = float(hdr['peak'])
-                    series.period = float(hdr['period'])
-                    series.power = float(hdr['power'])
-                    series.pulsed = float(hdr['pulsed'])
-                    click.secho(f"{hdr['events']} events.", fg='cyan')
-                    series.get_exposure()
-                    series.get_sampling()
-                    series.get_nyquist()
-                    series.get_fmin()
-                    series.get_fmax()
-                    series.get_delta()
-                    series.get_bins()
-                    series.get_harmonics()
-                    series.get_frequency()
-                    series.get_period()
-                    series.get_power()
-                    series.get_pfraction()
-                    series.set_gauss()
-                    series.set_bak()
-                    load_fits(series, ext)
-                    flag = 1
-                else:
-                    flag = load_fits(series, ext)
-            except KeyError:
+        events = catalog(series.input)
+        hdr = events['z2n']
+        if hdr is None:
+            flag = load_fits(series, ext)
+        else:
+            click.secho('Z2N extension already found', fg='yellow')
+            if click.confirm('Use the periodogram', prompt_suffix='? '):
+                series.bins = load_column(events, 'Z2N', 'FREQUENCY')
+                series.z2n = load_column(events, 'Z2N', 'POWER')
+                series.exposure = float(hdr['EXPOSURE'])
+                series.sampling = float(hdr['SAMPLING'])
+                series.nyquist = float(hdr['NYQUIST'])
+                series.harmonics = int(hdr['HARMONIC'])
+                series.fmin = float(hdr['FMIN'])
+                series.fmax = float(hdr['FMAX'])
+                series.delta = float(hdr['DELTA'])
+                series.frequency = float(hdr['PEAK'])
+                series.period = float(hdr['PERIOD'])
+                series.power = float(hdr['POWER'])
+                series.pulsed = float(hdr['PULSED'])
+                click.secho(f"{hdr['EVENTS']} events.", fg='cyan')
+                series.get_exposure()
+                series.get_sampling()
+                series.get_nyquist()
+                series.get_fmin()
+                series.get_fmax()
+                series.get_delta()
+                series.get_bins()
+                series.get_harmonics()
+                series.get_frequency()
+                series.get_period()
+                series.get_power()
+                series.get_pfraction()
+                series.set_bak()
+                series.set_gauss()
+                load_fits(series, ext)
+                flag = 1
+            else:
                 flag = load_fits(series, ext)
     return flag
 
 
-def load_ascii(series) -> int:
+def load_events(series, ext, interactive=True) -> int:
+    """
+    Open file and store time series, ignoring any periodogram.
+
+    Parameters
+    ----------
+    series : Series
+        A time series object.
+    ext : int
+        A int that represents the FITS extension number.
+    interactive : bool
+        A boolean that represents asking for a column when TIME is missing.
+
+    Returns
+    -------
+    None
+    """
+    suffix = pathlib.Path(series.input).suffix
+    if suffix in ("", ".txt"):
+        flag = load_ascii(series, interactive)
+    elif suffix in (".csv", ".ecsv"):
+        flag = load_csv(series, interactive)
+    elif suffix in (".hdf", ".h5", ".hdf5", ".he5"):
+        flag = load_hdf5(series, interactive)
+    else:
+        flag = load_fits(series, ext, interactive)
+    return flag
+
+
+def load_shard(path) -> dict:
+    """
+    Open a partial periodogram of a frequency shard.
+
+    Parameters
+    ----------
+    path : str
+        A string that represents the partial file path.
+
+    Returns
+    -------
+    shard : dict
+        A dict with the grid metadata, the frequency bins and the power.
+    """
+    with h5py.File(path, 'r') as partial:
+        shard = dict(partial.attrs)
+        shard['path'] = str(path)
+        shard['bins'] = partial['FREQUENCY'][:]
+        shard['z2n'] = partial['POWER'][:]
+    return shard
+
+
+def load_text(series, delimiter, name='TIME', chunk=2 ** 25) -> int:
+    """
+    Read only the needed columns of a text file, by chunks of lines.
+
+    The first line that is not a comment must have the column names. The
+    chunks are parsed by the C parser of numpy, on a pool of threads for
+    large files, and only the filtered events of each chunk are kept.
+
+    Parameters
+    ----------
+    series : Series
+        A time series object.
+    delimiter : str
+        A string that represents the column delimiter, None for whitespace.
+    name : str
+        A string that represents the column name.
+    chunk : int
+        An integer that represents the bytes parsed at once.
+
+    Returns
+    -------
+    flag : int
+        An integer that represents a file that needs the table reader.
+    """
+    with open(series.input, 'rb') as handle:
+        header = b''
+        while not header:
+            line = handle.readline()
+            if not line:
+                return 1
+            if line.strip() and not line.lstrip().startswith(b'#'):
+                header = line
+        names = [
+            value.strip().strip('"')
+            for value in header.decode().strip().split(delimiter)]
+        columns = [name] + [
+            column for column in series.filters if column != 'TIME']
+        if any(column not in names for column in columns):
+            return 1
+        usecols = [names.index(column) for column in columns]
+
+        def parse(block) -> np.array:
+            values = np.loadtxt(
+                io.BytesIO(block), delimiter=delimiter, usecols=usecols,
+                ndmin=2, dtype=np.float64, comments='#', quotechar='"')
+            if not series.filters:
+                return np.ascontiguousarray(values[:, 0])
+            filters = {
+                column: (values[:, columns.index(column)], 1, 0)
+                for column in series.filters if column != 'TIME'}
+            if 'TIME' in series.filters:
+                filters['TIME'] = (values[:, 0], 1, 0)
+            return select(
+                series, (values[:, 0], 1, 0), filters, np.empty((0, 2)))
+
+        threads = min(os.cpu_count() or 1, 8)
+        kept = []
+        pending = collections.deque()
+        try:
+            with futures.ThreadPoolExecutor(threads) as pool:
+                while True:
+                    block = handle.read(chunk)
+                    if not block:
+                        break
+                    block += handle.readline()
+                    pending.append(pool.submit(parse, block))
+                    if len(pending) > threads:
+                        kept.append(pending.popleft().result())
+                while pending:
+                    kept.append(pending.popleft().result())
+        except ValueError:
+            return 1
+    series.time = np.concatenate(kept) if kept else np.array([])
+    if series.filters:
+        click.secho(
+            f"{series.time.size} events kept by the filters.", fg='yellow')
+    return 0
+
+
+def load_ascii(series, interactive=True) -> int:
     """
     Open ascii file and store time series.
 
@@ -86,18 +224,27 @@ def load_ascii(series) -> int:
     ----------
     series : Series
         A time series object.
+    interactive : bool
+        A boolean that represents asking for a column when TIME is missing.
 
     Returns
     -------
     None
     """
+    if series.gti:
+        click.secho("Good time intervals need a FITS event file.", fg='red')
+        return 1
+    if not load_text(series, None):
+        return 0
     flag = 1
-    table = Table.read(series.input, format='ascii')
+    table = tables.Table.read(series.input, format='ascii')
     try:
-        series.time = table['TIME'].data
-        series.time = series.time.astype(series.time.dtype.name)
+        series.time = filter_table(series, table)
         flag = 0
     except (KeyError, TypeError, IndexError):
+        if not interactive:
+            click.secho(f"Column TIME not found in {series.input}.", fg='red')
+            return flag
         click.clear()
         column = 'TIME'
         flag = 1
@@ -107,8 +254,7 @@ def load_ascii(series) -> int:
                 click.secho(f"Column {column} not found.", fg='red')
                 column = click.prompt(
                     "Which column name", type=str, prompt_suffix='? ')
-                series.time = table[column].data
-                series.time = series.time.astype(series.time.dtype.name)
+                series.time = filter_table(series, table, column)
                 if click.confirm(f"Use column {column}", prompt_suffix='? '):
                     flag = 0
                 else:
@@ -118,7 +264,7 @@ def load_ascii(series) -> int:
     return flag
 
 
-def load_csv(series) -> int:
+def load_csv(series, interactive=True) -> int:
     """
     Open csv file and store time series.
 
@@ -126,18 +272,27 @@ def load_csv(series) -> int:
     ----------
     series : Series
         A time series object.
+    interactive : bool
+        A boolean that represents asking for a column when TIME is missing.
 
     Returns
     -------
     None
     """
+    if series.gti:
+        click.secho("Good time intervals need a FITS event file.", fg='red')
+        return 1
+    if not load_text(series, ','):
+        return 0
     flag = 1
-    table = Table.read(series.input, format='csv')
+    table = tables.Table.read(series.input, format='csv')
     try:
-        series.time = table['TIME'].data
-        series.time = series.time.astype(series.time.dtype.name)
+        series.time = filter_table(series, table)
         flag = 0
     except (KeyError, TypeError, IndexError):
+        if not interactive:
+            click.secho(f"Column TIME not found in {series.input}.", fg='red')
+            return flag
         click.clear()
         column = 'TIME'
         flag = 1
@@ -147,8 +302,7 @@ def load_csv(series) -> int:
                 click.secho(f"Column {column} not found.", fg='red')
                 column = click.prompt(
                     "Which column name", type=str, prompt_suffix='? ')
-                series.time = table[column].data
-                series.time = series.time.astype(series.time.dtype.name)
+                series.time = filter_table(series, table, column)
                 if click.confirm(f"Use column {column}", prompt_suffix='? '):
                     flag = 0
                 else:
@@ -158,7 +312,357 @@ def load_csv(series) -> int:
     return flag
 
 
-def load_fits(series, ext) -> None:
+@functools.lru_cache(maxsize=64)
+def index(path, mtime, size) -> dict:
+    """
+    Build the catalog of the extensions of a FITS file.
+
+    Parameters
+    ----------
+    path : str
+        A string that represents the resolved file path.
+    mtime : int
+        An integer that represents the modification time of the file.
+    size : int
+        An integer that represents the size of the file.
+
+    Returns
+    -------
+    catalog : dict
+        A dict with the extensions and the Z2N header, if any.
+    """
+    extensions = []
+    z2n = None
+    with fits.open(path) as events:
+        for number, hdu in enumerate(events):
+            info = events.fileinfo(number)
+            extension = {
+                'number': number,
+                'name': hdu.name,
+                'columns': [],
+                'rows': 0,
+                'layout': {},
+                'offset': info['datLoc'],
+                'mapped': False,
+            }
+            if isinstance(hdu, fits.BinTableHDU):
+                rows = hdu.header['NAXIS2']
+                width = hdu.header['NAXIS1']
+                dtype = hdu.columns.dtype
+                extension['columns'] = list(hdu.columns.names)
+                extension['rows'] = rows
+                extension['width'] = width
+                extension['mapped'] = bool(
+                    dtype.itemsize == width and info['filename']
+                    and not getattr(info['file'], 'compression', None)
+                    and hdu.header.get('THEAP', width * rows) == width * rows)
+                for column in hdu.columns:
+                    form, offset = dtype.fields[column.name][:2]
+                    extension['layout'][column.name.upper()] = (
+                        column.name, form.newbyteorder('>').str, offset,
+                        column.bscale, column.bzero,
+                        not form.shape and form.kind in 'iuf')
+            elif isinstance(hdu, fits.TableHDU):
+                extension['columns'] = list(hdu.columns.names)
+                extension['rows'] = hdu.header['NAXIS2']
+            extensions.append(extension)
+            if hdu.name == 'Z2N':
+                z2n = dict(hdu.header)
+    return {'path': path, 'extensions': extensions, 'z2n': z2n}
+
+
+def catalog(path) -> dict:
+    """
+    Return the catalog of a FITS file, built once for each version of it.
+
+    Parameters
+    ----------
+    path : str
+        A string that represents the file path.
+
+    Returns
+    -------
+    catalog : dict
+        A dict with the extensions and the Z2N header, if any.
+    """
+    path = pathlib.Path(path).resolve()
+    stat = path.stat()
+    return index(str(path), stat.st_mtime_ns, stat.st_size)
+
+
+def extension(catalog_, hdu) -> dict:
+    """
+    Find an extension on the catalog of a FITS file.
+
+    Parameters
+    ----------
+    catalog_ : dict
+        A dict with the extensions of the FITS file.
+    hdu : int, str
+        A int or str that represents the extension.
+
+    Returns
+    -------
+    extension : dict
+        A dict with the columns and the layout of the extension.
+    """
+    if isinstance(hdu, str):
+        for value in catalog_['extensions']:
+            if value['name'] == hdu.upper():
+                return value
+        raise KeyError(f"Extension {hdu} not found.")
+    return catalog_['extensions'][hdu]
+
+
+def map_column(catalog_, hdu, name) -> tuple:
+    """
+    Map a column of a binary table, without reading the other columns.
+
+    Parameters
+    ----------
+    catalog_ : dict
+        A dict with the extensions of the FITS file.
+    hdu : int, str
+        A int or str that represents the extension.
+    name : str
+        A string that represents the column name.
+
+    Returns
+    -------
+    column : tuple
+        A tuple with the stored values, the scale and the zero of the column.
+    """
+    table = extension(catalog_, hdu)
+    if name.upper() not in table['layout'] and name not in table['columns']:
+        raise KeyError(f"Column {name} not found.")
+    layout = table['layout'].get(name.upper())
+    if not table['mapped'] or not layout or not layout[5]:
+        with fits.open(catalog_['path']) as events:
+            return np.array(events[table['number']].data[name]), 1, 0
+    name, form, offset, scale, zero = layout[:5]
+    records = np.memmap(
+        catalog_['path'], mode='r', offset=table['offset'],
+        shape=(table['rows'],),
+        dtype=np.dtype({'names': [name], 'formats': [form],
+                        'offsets': [offset], 'itemsize': table['width']}))
+    return records[name], scale if scale else 1, zero if zero else 0
+
+
+def load_column(catalog_, hdu, name, chunk=2 ** 20) -> np.array:
+    """
+    Read a column of a binary table, memory mapping only that column.
+
+    The column is adopted without copies when it already is a contiguous
+    array of native doubles, and it is converted by chunks otherwise, so
+    the other columns of the table are never read.
+
+    Parameters
+    ----------
+    catalog_ : dict
+        A dict with the extensions of the FITS file.
+    hdu : int, str
+        A int or str that represents the extension.
+    name : str
+        A string that represents the column name.
+    chunk : int
+        An integer that represents the rows converted at once.
+
+    Returns
+    -------
+    values : np.array
+        An array that represents the column.
+    """
+    values, scale, zero = map_column(catalog_, hdu, name)
+    if values.dtype == np.float64 and values.flags.c_contiguous and (
+            scale == 1) and not zero:
+        return values
+    times = np.empty(values.size, dtype=np.float64)
+    for start in range(0, values.size, chunk):
+        times[start:start + chunk] = values[start:start + chunk]
+    if scale != 1:
+        times *= scale
+    if zero:
+        times += zero
+    return times
+
+
+def load_gti(catalog_) -> np.array:
+    """
+    Read the good time intervals of a FITS file.
+
+    Parameters
+    ----------
+    catalog_ : dict
+        A dict with the extensions of the FITS file.
+
+    Returns
+    -------
+    gti : np.array
+        An array with the sorted and merged intervals, one per row.
+    """
+    for table in catalog_['extensions']:
+        if 'GTI' in table['name'] and all(
+                column in table['layout'] for column in ('START', 'STOP')):
+            start = load_column(catalog_, table['number'], 'START')
+            stop = load_column(catalog_, table['number'], 'STOP')
+            order = np.argsort(start)
+            start, stop = start[order], stop[order]
+            merged = []
+            for low, high in zip(start, stop):
+                if merged and low <= merged[-1][1]:
+                    merged[-1][1] = max(merged[-1][1], high)
+                else:
+                    merged.append([low, high])
+            return np.array(merged, dtype=np.float64).reshape(-1, 2)
+    raise KeyError("Extension GTI not found.")
+
+
+def predicates(tmin, tmax, ranges) -> dict:
+    """
+    Combine the time range and the column ranges in the filters.
+
+    Parameters
+    ----------
+    tmin : float
+        A float that represents the minimum time, None for no limit.
+    tmax : float
+        A float that represents the maximum time, None for no limit.
+    ranges : tuple
+        A tuple with the column name, the minimum and the maximum values.
+
+    Returns
+    -------
+    filters : dict
+        A dictionary with the range of each filtered column.
+    """
+    filters = {}
+    if tmin is not None or tmax is not None:
+        filters['TIME'] = (
+            float('-inf') if tmin is None else tmin,
+            float('inf') if tmax is None else tmax)
+    for column, low, high in ranges:
+        filters['TIME' if column.upper() == 'TIME' else column] = (low, high)
+    return filters
+
+
+def select(series, times, columns, gti, chunk=2 ** 20) -> np.array:
+    """
+    Keep the events that satisfy the filters, evaluated by chunks.
+
+    Parameters
+    ----------
+    series : Series
+        A time series object.
+    times : tuple
+        A tuple with the stored times, the scale and the zero.
+    columns : dict
+        A dict with a tuple like the times for each filtered column.
+    gti : np.array
+        An array with the good time intervals, empty to keep every time.
+    chunk : int
+        An integer that represents the rows evaluated at once.
+
+    Returns
+    -------
+    time : np.array
+        An array that represents the kept times.
+    """
+    values, scale, zero = times
+    kept = []
+    for start in range(0, len(values), chunk):
+        time = np.asarray(values[start:start + chunk], dtype=np.float64)
+        time = time * scale + zero
+        mask = np.ones(time.size, dtype=bool)
+        for name, (column, factor, offset) in columns.items():
+            low, high = series.filters[name]
+            value = np.asarray(column[start:start + chunk], dtype=np.float64)
+            value = value * factor + offset
+            mask &= (value >= low) & (value <= high)
+        if gti.size:
+            index = np.searchsorted(gti[:, 0], time, side='right') - 1
+            mask &= (index >= 0) & (time < gti[np.maximum(index, 0), 1])
+        kept.append(time[mask])
+    if not kept:
+        return np.array([], dtype=np.float64)
+    return np.concatenate(kept)
+
+
+def load_times(series, catalog_, hdu, name='TIME') -> np.array:
+    """
+    Read the times of a binary table, keeping only the filtered events.
+
+    Parameters
+    ----------
+    series : Series
+        A time series object.
+    catalog_ : dict
+        A dict with the extensions of the FITS file.
+    hdu : int, str
+        A int or str that represents the extension.
+    name : str
+        A string that represents the column name.
+
+    Returns
+    -------
+    time : np.array
+        An array that represents the kept times.
+    """
+    if not series.filters and not series.gti:
+        return load_column(catalog_, hdu, name)
+    columns = {}
+    for column in series.filters:
+        try:
+            columns[column] = map_column(
+                catalog_, hdu, name if column == 'TIME' else column)
+        except KeyError:
+            click.secho(f"Column {column} not found.", fg='red')
+            raise
+    gti = np.empty((0, 2))
+    if series.gti:
+        try:
+            gti = load_gti(catalog_)
+        except KeyError:
+            click.secho("Extension GTI not found.", fg='red')
+            raise
+    time = select(series, map_column(catalog_, hdu, name), columns, gti)
+    click.secho(f"{time.size} events kept by the filters.", fg='yellow')
+    return time
+
+
+def filter_table(series, table, name='TIME') -> np.array:
+    """
+    Read the times of a table, keeping only the filtered events.
+
+    Parameters
+    ----------
+    series : Series
+        A time series object.
+    table : Table
+        A table with the events.
+    name : str
+        A string that represents the column name.
+
+    Returns
+    -------
+    time : np.array
+        An array that represents the kept times.
+    """
+    if not series.filters:
+        return table[name].data
+    columns = {}
+    for column in series.filters:
+        try:
+            columns[column] = (
+                table[name if column == 'TIME' else column].data, 1, 0)
+        except KeyError:
+            click.secho(f"Column {column} not found.", fg='red')
+            raise
+    time = select(series, (table[name].data, 1, 0), columns, np.empty((0, 2)))
+    click.secho(f"{time.size} events kept by the filters.", fg='yellow')
+    return time
+
+
+def load_fits(series, ext, interactive=True) -> None:
     """
     Open fits file and store time series.
 
@@ -166,6 +670,10 @@ def load_fits(series, ext) -> None:
     ----------
     series : Series
         A time series object.
+    ext : int
+        A int that represents the FITS extension number.
+    interactive : bool
+        A boolean that represents asking for a column when TIME is missing.
 
     Returns
     -------
@@ -175,115 +683,236 @@ def load_fits(series, ext) -> None:
     times = 0
     columns = ['TIME', 'time']
     extensions = []
-    with fits.open(series.input) as events:
-        if ext:
-            try:
-                series.time = events[ext].data['TIME']
-                series.time = series.time.astype(series.time.dtype.name)
-                click.secho(
-                    f"Column TIME in {events[ext].name}.", fg='yellow')
-                flag = 0
-            except (KeyError, TypeError):
-                flag = 1
-                click.secho(
-                    f"Column TIME not found in {events[ext].name}.", fg='red')
-            except IndexError:
-                flag = 1
-                click.secho(
-                    f"Extension number {ext} not found.", fg='red')
-        else:
-            for hdu in range(1, len(events)):
+    events = catalog(series.input)
+    hdus = events['extensions']
+    if ext:
+        try:
+            series.time = load_times(series, events, ext)
+            click.secho(
+                f"Column TIME in {hdus[ext]['name']}.", fg='yellow')
+            flag = 0
+        except (KeyError, TypeError):
+            flag = 1
+            click.secho(
+                f"Column TIME not found in {hdus[ext]['name']}.", fg='red')
+        except IndexError:
+            flag = 1
+            click.secho(
+                f"Extension number {ext} not found.", fg='red')
+    else:
+        for hdu in range(1, len(hdus)):
+            if any(column in hdus[hdu]['columns'] for column in columns):
+                extensions.append(hdu)
+                times += 1
+        if times == 1:
+            click.secho(
+                f"Column TIME in {hdus[extensions[0]]['name']}.", fg='yellow')
+            series.time = load_times(series, events, extensions[0])
+            flag = 0
+        elif times > 1 and not interactive:
+            click.secho(
+                f"Multiple columns TIME found in {series.input}.", fg='red')
+            flag = 1
+        elif times > 1:
+            click.secho("Multiple columns TIME found.", fg='yellow')
+            flag = 1
+            while flag:
+                table = tables.Table(
+                    names=('Number', 'Extension', 'Length (Rows)'),
+                    dtype=('int64', 'str', 'int64'))
+                for value in extensions:
+                    table.add_row([
+                        value,
+                        hdus[value]['name'],
+                        hdus[value]['rows']])
+                table.pprint()
+                number = click.prompt(
+                    "Which extension number", type=int, prompt_suffix='? ')
                 try:
-                    if any(column in events[hdu].columns.names for column in columns):
-                        extensions.append(hdu)
-                        times += 1
-                except AttributeError:
-                    pass
-            if times == 1:
-                click.secho(
-                    f"Column TIME in {events[extensions[0]].name}.", fg='yellow')
-                series.time = events[extensions[0]].data['TIME']
-                series.time = series.time.astype(series.time.dtype.name)
-                flag = 0
-            elif times > 1:
-                click.secho("Multiple columns TIME found.", fg='yellow')
-                flag = 1
-                while flag:
-                    table = Table(
-                        names=('Number', 'Extension', 'Length (Rows)'),
-                        dtype=('int64', 'str', 'int64'))
-                    for value in extensions:
-                        table.add_row([
-                            value,
-                            events[value].name,
-                            events[value].data['TIME'].size])
-                    table.pprint()
-                    number = click.prompt(
-                        "Which extension number", type=int, prompt_suffix='? ')
-                    try:
-                        if click.confirm(f"Use column in {events[number].name}"):
-                            series.time = events[number].data['TIME']
-                            series.time = series.time.astype(
-                                series.time.dtype.name)
-                            flag = 0
-                            break
-                        else:
-                            flag = 1
-                            click.clear()
-                    except (KeyError, TypeError):
+                    if click.confirm(f"Use column in {hdus[number]['name']}"):
+                        series.time = load_times(series, events, number)
+                        flag = 0
+                        break
+                    else:
                         flag = 1
                         click.clear()
-                        click.secho(
-                            f"Column TIME not found in {events[number].name}.",
-                            fg='red')
-                    except IndexError:
-                        flag = 1
-                        click.clear()
-                        click.secho(
-                            f"Extension number {number} not found.", fg='red')
-            else:
-                click.clear()
-                column = 'TIME'
-                flag = 1
-                while flag:
-                    hdu = 1
-                    while hdu < len(events):
-                        table = Table(events[hdu].data)
-                        table.pprint()
-                        click.secho(
-                            f"Column {column} not found in extension.", fg='red')
-                        click.secho(
-                            f"Extension {events[hdu].name}.", fg='yellow')
-                        if click.confirm("Use extension [y] or go to next [n]"):
-                            try:
-                                column = click.prompt(
-                                    "Which column name", type=str, prompt_suffix='? ')
-                                series.time = events[hdu].data[column]
-                                series.time = series.time.astype(
-                                    series.time.dtype.name)
-                                if click.confirm(
-                                        f"Use column {column}", prompt_suffix='? '):
-                                    flag = 0
-                                    break
-                                else:
-                                    flag = 1
-                                    click.clear()
-                            except (KeyError, TypeError):
-                                flag = 1
-                                click.clear()
-                            except IndexError:
+                except (KeyError, TypeError):
+                    flag = 1
+                    click.clear()
+                    click.secho(
+                        f"Column TIME not found in {hdus[number]['name']}.",
+                        fg='red')
+                except IndexError:
+                    flag = 1
+                    click.clear()
+                    click.secho(
+                        f"Extension number {number} not found.", fg='red')
+        elif not interactive:
+            click.secho(
+                f"Column TIME not found in {series.input}.", fg='red')
+            flag = 1
+        else:
+            click.clear()
+            column = 'TIME'
+            flag = 1
+            while flag:
+                hdu = 1
+                while hdu < len(hdus):
+                    with fits.open(series.input) as values:
+                        table = tables.Table(values[hdu].data)
+                    table.pprint()
+                    click.secho(
+                        f"Column {column} not found in extension.", fg='red')
+                    click.secho(
+                        f"Extension {hdus[hdu]['name']}.", fg='yellow')
+                    if click.confirm("Use extension [y] or go to next [n]"):
+                        try:
+                            column = click.prompt(
+                                "Which column name", type=str, prompt_suffix='? ')
+                            series.time = load_times(series, events, hdu, column)
+                            if click.confirm(
+                                    f"Use column {column}", prompt_suffix='? '):
+                                flag = 0
+                                break
+                            else:
                                 flag = 1
                                 click.clear()
-                                click.secho(
-                                    f"Extension number {hdu} not found.", fg='red')
-                        else:
+                        except (KeyError, TypeError):
                             flag = 1
-                            hdu += 1
                             click.clear()
+                        except IndexError:
+                            flag = 1
+                            click.clear()
+                            click.secho(
+                                f"Extension number {hdu} not found.", fg='red')
+                    else:
+                        flag = 1
+                        hdu += 1
+                        click.clear()
     return flag
 
 
-def load_hdf5(series) -> int:
+def find_dataset(events, name='TIME') -> tuple:
+    """
+    Find the dataset with the times on a hdf5 file.
+
+    Parameters
+    ----------
+    events : File
+        A hdf5 file with the events.
+    name : str
+        A string that represents the column name.
+
+    Returns
+    -------
+    dataset : tuple
+        A tuple with the dataset and the group of its columns, None if the
+        times are the field of a table.
+    """
+    found = []
+
+    def visit(path, value) -> None:
+        if found or not isinstance(value, h5py.Dataset) or value.ndim != 1:
+            return
+        if value.dtype.names and name in value.dtype.names:
+            found.append((value, None))
+        elif path.rsplit('/', 1)[-1] == name and value.dtype.kind in 'iuf':
+            found.append((value, value.parent))
+
+    events.visititems(visit)
+    if not found:
+        raise KeyError(f"Column {name} not found.")
+    return found[0]
+
+
+def map_dataset(events, dataset, group, name) -> tuple:
+    """
+    Map a column of a hdf5 file, or slice it by chunks if it can not be.
+
+    Parameters
+    ----------
+    events : File
+        A hdf5 file with the events.
+    dataset : Dataset
+        A dataset with the times.
+    group : Group
+        A group with a dataset for each column, None for a table.
+    name : str
+        A string that represents the column name.
+
+    Returns
+    -------
+    column : tuple
+        A tuple with the stored values, the scale and the zero.
+    """
+    if group is not None:
+        column = group[name]
+        if not isinstance(column, h5py.Dataset) or column.shape != dataset.shape:
+            raise KeyError(f"Column {name} not found.")
+    elif name in dataset.dtype.names:
+        column = dataset
+    else:
+        raise KeyError(f"Column {name} not found.")
+    offset = column.id.get_offset()
+    if column.chunks is None and offset is not None and (
+            events.driver in ('sec2', 'stdio')):
+        values = np.memmap(events.filename, mode='r', dtype=column.dtype,
+                           offset=offset, shape=column.shape)
+        return (values if group is not None else values[name]), 1, 0
+    return (column if group is not None else column.fields(name)), 1, 0
+
+
+def load_dataset(series, name='TIME', chunk=2 ** 20) -> int:
+    """
+    Read the times of a hdf5 file, slicing only the time column.
+
+    The times are either a field of a compound dataset or a dataset of a
+    group, with the other columns on datasets of the same group. Contiguous
+    datasets are memory mapped, chunked ones are read by slices aligned to
+    their chunks, so the other columns are never read.
+
+    Parameters
+    ----------
+    series : Series
+        A time series object.
+    name : str
+        A string that represents the column name.
+    chunk : int
+        An integer that represents the rows read at once.
+
+    Returns
+    -------
+    flag : int
+        An integer that represents a file that needs the table reader.
+    """
+    try:
+        with h5py.File(series.input, 'r') as events:
+            dataset, group = find_dataset(events, name)
+            if dataset.chunks:
+                chunk = max(chunk // dataset.chunks[0], 1) * dataset.chunks[0]
+            values = map_dataset(events, dataset, group, name)[0]
+            if not series.filters:
+                if isinstance(values, np.ndarray) and (
+                        values.dtype == np.float64) and values.flags.c_contiguous:
+                    series.time = values
+                    return 0
+                series.time = np.empty(len(values), dtype=np.float64)
+                for start in range(0, len(values), chunk):
+                    series.time[start:start + chunk] = values[start:start + chunk]
+                return 0
+            columns = {
+                column: map_dataset(
+                    events, dataset, group, name if column == 'TIME' else column)
+                for column in series.filters}
+            series.time = select(
+                series, (values, 1, 0), columns, np.empty((0, 2)), chunk)
+            click.secho(f"{series.time.size} events kept by the filters.", fg='yellow')
+    except (OSError, KeyError, TypeError):
+        return 1
+    return 0
+
+
+def load_hdf5(series, interactive=True) -> int:
     """
     Open hdf5 file and store time series.
 
@@ -291,18 +920,27 @@ def load_hdf5(series) -> int:
     ----------
     series : Series
         A time series object.
+    interactive : bool
+        A boolean that represents asking for a column when TIME is missing.
 
     Returns
     -------
     None
     """
+    if series.gti:
+        click.secho("Good time intervals need a FITS event file.", fg='red')
+        return 1
+    if not load_dataset(series):
+        return 0
     flag = 1
-    table = Table.read(series.input, format='hdf5')
+    table = tables.Table.read(series.input, format='hdf5')
     try:
-        series.time = table['TIME'].data
-        series.time = series.time.astype(series.time.dtype.name)
+        series.time = filter_table(series, table)
         flag = 0
     except (KeyError, TypeError, IndexError):
+        if not interactive:
+            click.secho(f"Column TIME not found in {series.input}.", fg='red')
+            return flag
         click.clear()
         column = 'TIME'
         flag = 1
@@ -312,8 +950,7 @@ def load_hdf5(series) -> int:
                 click.secho(f"Column {column} not found.", fg='red')
                 column = click.prompt(
                     "Which column name", type=str, prompt_suffix='? ')
-                series.time = table[column].data
-                series.time = series.time.astype(series.time.dtype.name)
+                series.time = filter_table(series, table, column)
                 if click.confirm(f"Use column {column}", prompt_suffix='? '):
                     flag = 0
                 else:
@@ -323,6 +960,24 @@ def load_hdf5(series) -> int:
     return flag
 
 
+def filename(series) -> str:
+    """
+    Return the path of the output file of the periodogram.
+
+    Parameters
+    ----------
+    series : Series
+        A time series object.
+
+    Returns
+    -------
+    path : str
+        A string that represents the output file path.
+    """
+    suffix = "txt" if series.format == 'ascii' else series.format
+    return f'{series.output}.{suffix}'
+
+
 def save_ascii(series) -> None:
     """
     Save the periodogram to ascii file.
@@ -337,8 +992,8 @@ def save_ascii(series) -> None:
     None
     """
     array = np.column_stack((series.bins, series.z2n))
-    table = Table(array, names=('FREQUENCY', 'POWER'))
-    table.write(f'{series.output}.txt', format='ascii')
+    table = tables.Table(array, names=('FREQUENCY', 'POWER'))
+    table.write(filename(series), format='ascii')
 
 
 def save_csv(series) -> None:
@@ -355,11 +1010,74 @@ def save_csv(series) -> None:
     None
     """
     array = np.column_stack((series.bins, series.z2n))
-    table = Table(array, names=('FREQUENCY', 'POWER'))
+    table = tables.Table(array, names=('FREQUENCY', 'POWER'))
     table.write(f'{series.output}.csv', format='csv')
 
 
-def save_fits(series) -> None:
+def header(series, steps, events=0) -> 'fits.Header':
+    """
+    Create the header of the periodogram extension.
+
+    Parameters
+    ----------
+    series : Series
+        A time series object.
+    steps : int
+        A int that represents the number of steps.
+    events : int
+        A int that represents the number of events, those of the series if 0.
+
+    Returns
+    -------
+    hdr : fits.Header
+        A header that represents the periodogram extension.
+    """
+    hdr = fits.Header()
+    hdr['EXTNAME'] = 'Z2N'
+    hdr.comments['EXTNAME'] = 'Name of this extension'
+    hdr['HDUNAME'] = 'Z2N'
+    hdr.comments['HDUNAME'] = 'Name of the hdu'
+    hdr['events'] = f'{events if events else series.time.size}'
+    hdr.comments['events'] = 'Number of events'
+    hdr['exposure'] = f'{series.exposure}'
+    hdr.comments['exposure'] = 'Exposure time (Texp)'
+    hdr['sampling'] = f'{series.sampling}'
+    hdr.comments['sampling'] = 'Sampling rate (1/Texp)'
+    hdr['nyquist'] = f'{series.nyquist}'
+    hdr.comments['nyquist'] = 'Nyquist 2*(1/Texp)'
+    hdr['harmonic'] = f'{series.harmonics}'
+    hdr.comments['harmonic'] = 'Number of harmonics'
+    hdr['steps'] = f'{steps}'
+    hdr.comments['steps'] = 'Number of steps'
+    hdr['fmin'] = f'{series.fmin}'
+    hdr.comments['fmin'] = 'Minimum frequency'
+    hdr['fmax'] = f'{series.fmax}'
+    hdr.comments['fmax'] = 'Maximum frequency'
+    hdr['delta'] = f'{series.delta}'
+    hdr.comments['delta'] = 'Frequency steps'
+    hdr['peak'] = f'{series.frequency}'
+    hdr.comments['peak'] = 'Global peak frequency'
+    hdr['period'] = f'{series.period}'
+    hdr.comments['period'] = 'Global peak period'
+    hdr['power'] = f'{series.power}'
+    hdr.comments['power'] = 'Global peak power'
+    hdr['pulsed'] = f'{series.pulsed}'
+    hdr.comments['pulsed'] = 'Global pulsed fraction'
+    try:
+        hdr['gpeak'] = f'{series.gauss.frequency}'
+        hdr.comments['gpeak'] = 'Gauss peak frequency'
+        hdr['gperiod'] = f'{series.gauss.period}'
+        hdr.comments['gperiod'] = 'Gauss peak period'
+        hdr['gpower'] = f'{series.gauss.power}'
+        hdr.comments['gpower'] = 'Gauss peak power'
+        hdr['gpulsed'] = f'{series.gauss.pulsed}'
+        hdr.comments['gpulsed'] = 'Gauss pulsed fraction'
+    except AttributeError:
+        pass
+    return hdr
+
+
+def save_fits(series, events=0) -> None:
     """
     Save the periodogram to fits file.
 
@@ -367,109 +1085,25 @@ def save_fits(series) -> None:
     ----------
     series : Series
         A time series object.
+    events : int
+        A int that represents the number of events, those of the series if 0.
 
     Returns
     -------
     None
     """
+    bins = fits.Column(
+        name='FREQUENCY', array=series.bins, format='D', unit='Hz')
+    z2n = fits.Column(name='POWER', array=series.z2n, format='D')
+    hdr = header(series, series.z2n.size, events)
     suffix = pathlib.Path(series.input).suffix
     if suffix in ("", ".txt", ".csv", ".ecsv", ".hdf", ".h5", ".hdf5", ".he5"):
         primary_hdu = fits.PrimaryHDU()
-        bins = fits.Column(
-            name='FREQUENCY', array=series.bins, format='D', unit='Hz')
-        z2n = fits.Column(name='POWER', array=series.z2n, format='D')
-        hdr = fits.Header()
-        hdr['EXTNAME'] = 'Z2N'
-        hdr.comments['EXTNAME'] = 'Name of this extension'
-        hdr['HDUNAME'] = 'Z2N'
-        hdr.comments['HDUNAME'] = 'Name of the hdu'
-        hdr['events'] = f'{series.time.size}'
-        hdr.comments['events'] = 'Number of events'
-        hdr['exposure'] = f'{series.exposure}'
-        hdr.comments['exposure'] = 'Exposure time (Texp)'
-        hdr['sampling'] = f'{series.sampling}'
-        hdr.comments['sampling'] = 'Sampling rate (1/Texp)'
-        hdr['nyquist'] = f'{series.nyquist}'
-        hdr.comments['nyquist'] = 'Nyquist 2*(1/Texp)'
-        hdr['harmonic'] = f'{series.harmonics}'
-        hdr.comments['harmonic'] = 'Number of harmonics'
-        hdr['steps'] = f'{series.z2n.size}'
-        hdr.comments['steps'] = 'Number of steps'
-        hdr['fmin'] = f'{series.fmin}'
-        hdr.comments['fmin'] = 'Minimum frequency'
-        hdr['fmax'] = f'{series.fmax}'
-        hdr.comments['fmax'] = 'Maximum frequency'
-        hdr['delta'] = f'{series.delta}'
-        hdr.comments['delta'] = 'Frequency steps'
-        hdr['peak'] = f'{series.frequency}'
-        hdr.comments['peak'] = 'Global peak frequency'
-        hdr['period'] = f'{series.period}'
-        hdr.comments['period'] = 'Global peak period'
-        hdr['power'] = f'{series.power}'
-        hdr.comments['power'] = 'Global peak power'
-        hdr['pulsed'] = f'{series.pulsed}'
-        hdr.comments['pulsed'] = 'Global pulsed fraction'
-        try:
-            hdr['gpeak'] = f'{series.gauss.frequency}'
-            hdr.comments['gpeak'] = 'Gauss peak frequency'
-            hdr['gperiod'] = f'{series.gauss.period}'
-            hdr.comments['gperiod'] = 'Gauss peak period'
-            hdr['gpower'] = f'{series.gauss.power}'
-            hdr.comments['gpower'] = 'Gauss peak power'
-            hdr['gpulsed'] = f'{series.gauss.pulsed}'
-            hdr.comments['gpulsed'] = 'Gauss pulsed fraction'
-        except AttributeError:
-            pass
         table_hdu = fits.BinTableHDU.from_columns([bins, z2n], header=hdr)
         hdul = fits.HDUList([primary_hdu, table_hdu])
         hdul.writeto(f'{series.output}.fits')
     else:
         with fits.open(series.input) as events:
-            bins = fits.Column(
-                name='FREQUENCY', array=series.bins, format='D', unit='Hz')
-            z2n = fits.Column(name='POWER', array=series.z2n, format='D')
-            hdr = fits.Header()
-            hdr['EXTNAME'] = 'Z2N'
-            hdr.comments['EXTNAME'] = 'Name of this extension'
-            hdr['HDUNAME'] = 'Z2N'
-            hdr.comments['HDUNAME'] = 'Name of the hdu'
-            hdr['events'] = f'{series.time.size}'
-            hdr.comments['events'] = 'Number of events'
-            hdr['exposure'] = f'{series.exposure}'
-            hdr.comments['exposure'] = 'Exposure time (Texp)'
-            hdr['sampling'] = f'{series.sampling}'
-            hdr.comments['sampling'] = 'Sampling rate (1/Texp)'
-            hdr['nyquist'] = f'{series.nyquist}'
-            hdr.comments['nyquist'] = 'Nyquist 2*(1/Texp)'
-            hdr['harmonic'] = f'{series.harmonics}'
-            hdr.comments['harmonic'] = 'Number of harmonics'
-            hdr['steps'] = f'{series.z2n.size}'
-            hdr.comments['steps'] = 'Number of steps'
-            hdr['fmin'] = f'{series.fmin}'
-            hdr.comments['fmin'] = 'Minimum frequency'
-            hdr['fmax'] = f'{series.fmax}'
-            hdr.comments['fmax'] = 'Maximum frequency'
-            hdr['delta'] = f'{series.delta}'
-            hdr.comments['delta'] = 'Frequency steps'
-            hdr['peak'] = f'{series.frequency}'
-            hdr.comments['peak'] = 'Global peak frequency'
-            hdr['period'] = f'{series.period}'
-            hdr.comments['period'] = 'Global peak period'
-            hdr['power'] = f'{series.power}'
-            hdr.comments['power'] = 'Global peak power'
-            hdr['pulsed'] = f'{series.pulsed}'
-            hdr.comments['pulsed'] = 'Global pulsed fraction'
-            try:
-                hdr['gpeak'] = f'{series.gauss.frequency}'
-                hdr.comments['gpeak'] = 'Gauss peak frequency'
-                hdr['gperiod'] = f'{series.gauss.period}'
-                hdr.comments['gperiod'] = 'Gauss peak period'
-                hdr['gpower'] = f'{series.gauss.power}'
-                hdr.comments['gpower'] = 'Gauss peak power'
-                hdr['gpulsed'] = f'{series.gauss.pulsed}'
-                hdr.comments['gpulsed'] = 'Gauss pulsed fraction'
-            except AttributeError:
-                pass
             hdu = fits.BinTableHDU.from_columns([bins, z2n], header=hdr)
             events.append(hdu)
             events.writeto(f'{series.output}.fits')
@@ -489,6 +1123,151 @@ def save_hdf5(series) -> None:
     None
     """
     array = np.column_stack((series.bins, series.z2n))
-    table = Table(array, names=('FREQUENCY', 'POWER'))
+    table = tables.Table(array, names=('FREQUENCY', 'POWER'))
     table.write(f'{series.output}.hdf5', path='z2n',
                 format='hdf5', compression=True)
+
+
+def open_stream(series, steps):
+    """
+    Create the output file of a streamed periodogram.
+
+    Parameters
+    ----------
+    series : Series
+        A time series object.
+    steps : int
+        A int that represents the number of steps.
+
+    Returns
+    -------
+    stream : object
+        An object that represents the open output file.
+    """
+    path = filename(series)
+    if series.format == 'hdf5':
+        stream = h5py.File(path, 'w', libver='latest')
+        stream.create_dataset(
+            'z2n', shape=(0,), maxshape=(None,), chunks=(2 ** 14,),
+            dtype=[('FREQUENCY', '<f8'), ('POWER', '<f8')],
+            compression='gzip')
+        stream.attrs['events'] = series.time.size
+        stream.attrs['harmonics'] = series.harmonics
+        stream.attrs['fmin'] = series.fmin
+        stream.attrs['delta'] = series.delta
+        stream.attrs['steps'] = steps
+        stream.swmr_mode = True
+    elif series.format == 'fits':
+        suffix = pathlib.Path(series.input).suffix
+        if suffix not in (
+                "", ".txt", ".csv", ".ecsv", ".hdf", ".h5", ".hdf5", ".he5"):
+            with fits.open(series.input) as events:
+                events.writeto(path)
+        columns = [
+            fits.Column(name='FREQUENCY', array=np.zeros(0), format='D', unit='Hz'),
+            fits.Column(name='POWER', array=np.zeros(0), format='D')]
+        hdr = fits.BinTableHDU.from_columns(
+            columns, header=header(series, steps)).header
+        hdr['NAXIS2'] = steps
+        stream = fits.StreamingHDU(path, hdr)
+    else:
+        stream = open(path, 'w')
+        delimiter = ',' if series.format == 'csv' else ' '
+        stream.write(f'FREQUENCY{delimiter}POWER\n')
+        stream.flush()
+    return stream
+
+
+def save_chunk(series, stream, bins, values) -> None:
+    """
+    Append a chunk of the periodogram to the output file.
+
+    Parameters
+    ----------
+    series : Series
+        A time series object.
+    stream : object
+        An object that represents the open output file.
+    bins : np.array
+        An array that represents the frequency bins of the chunk.
+    values : np.array
+        An array that represents the Z2n power of the chunk.
+
+    Returns
+    -------
+    None
+    """
+    if series.format == 'hdf5':
+        dataset = stream['z2n']
+        size = dataset.shape[0]
+        dataset.resize((size + bins.size,))
+        rows = np.empty(bins.size, dtype=dataset.dtype)
+        rows['FREQUENCY'] = bins
+        rows['POWER'] = values
+        dataset[size:] = rows
+        dataset.flush()
+    elif series.format == 'fits':
+        rows = np.empty(bins.size, dtype=[('FREQUENCY', '>f8'), ('POWER', '>f8')])
+        rows['FREQUENCY'] = bins
+        rows['POWER'] = values
+        stream.write(rows.view(np.uint8))
+    else:
+        delimiter = ',' if series.format == 'csv' else ' '
+        np.savetxt(stream, np.column_stack((bins, values)),
+                   fmt='%.17g', delimiter=delimiter)
+        stream.flush()
+
+
+def close_stream(series, stream) -> None:
+    """
+    Close the output file of a streamed periodogram.
+
+    Parameters
+    ----------
+    series : Series
+        A time series object.
+    stream : object
+        An object that represents the open output file.
+
+    Returns
+    -------
+    None
+    """
+    stream.close()
+    if series.format == 'fits':
+        with fits.open(f'{series.output}.fits', mode='update') as hdul:
+            hdr = hdul['Z2N'].header
+            hdr['peak'] = f'{series.frequency}'
+            hdr['period'] = f'{series.period}'
+            hdr['power'] = f'{series.power}'
+            hdr['pulsed'] = f'{series.pulsed}'
+
+
+def save_shard(series, spec) -> None:
+    """
+    Save the partial periodogram of a frequency shard.
+
+    Parameters
+    ----------
+    series : Series
+        A time series object.
+    spec : dict
+        A dict that represents the shard specification.
+
+    Returns
+    -------
+    None
+    """
+    with h5py.File(spec['partial'], 'w') as partial:
+        partial.create_dataset('FREQUENCY', data=series.bins)
+        partial.create_dataset('POWER', data=series.z2n)
+        for key in ('input', 'ext', 'fmin', 'fmax', 'delta', 'total',
+                    'harmonics', 'method', 'precision', 'tolerance', 'binning',
+                    'index', 'shards', 'start', 'count'):
+            partial.attrs[key] = spec[key]
+        partial.attrs['filters'] = json.dumps(spec.get('filters', {}))
+        partial.attrs['gti'] = bool(spec.get('gti', False))
+        partial.attrs['events'] = series.time.size
+        partial.attrs['exposure'] = series.exposure
+        partial.attrs['sampling'] = series.sampling
+        partial.attrs['nyquist'] = series.nyquist
@@ -0,0 +1,80 @@
+#! /usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Other Libraries
+import click
+
+
+class Fit:
+    """
+    A class to represent the gaussian fit of a periodogram.
+
+    The frequency bins and the power are views of the fitted region, so
+    the events and the periodogram of the series are never copied.
+
+    Attributes
+    ----------
+    * `bins : np.array`
+    > An arrray that represents the frequency bins of the fit.
+    * `z2n : np.array`
+    > An arrray that represents the gaussian curve.
+    * `power : float`
+    > A float that represents the peak power.
+    * `frequency : float`
+    > A float that represents the peak frequency.
+    * `period : float`
+    > A float that represents the peak period.
+    * `errorf : float`
+    > A float that represents the frequency uncertainty.
+    * `errorp : float`
+    > A float that represents the period uncertainty.
+    * `pulsed : float`
+    > A float that represents the pulsed fraction.
+
+    Methods
+    -------
+    """
+
+    __slots__ = (
+        'bins', 'z2n', 'power', 'frequency', 'period', 'errorf', 'errorp',
+        'pulsed')
+
+    def __init__(self, series) -> None:
+        self.bins = series.bins
+        self.z2n = series.z2n
+        self.power = series.power
+        self.frequency = series.frequency
+        self.period = series.period
+        self.errorf = series.errorf
+        self.errorp = series.errorp
+        self.pulsed = series.pulsed
+
+    def get_power(self) -> float:
+        """Return the peak power."""
+        click.secho(f"Peak power: {self.power}", fg='cyan')
+        return self.power
+
+    def get_frequency(self) -> float:
+        """Return the peak frequency."""
+        click.secho(f"Peak frequency: {self.frequency} Hz", fg='cyan')
+        return self.frequency
+
+    def get_period(self) -> float:
+        """Return the peak period."""
+        click.secho(f"Peak period: {self.period} s", fg='cyan')
+        return self.period
+
+    def get_pfraction(self) -> float:
+        """Return the pulsed fraction."""
+        click.secho(f"Pulsed fraction: {self.pulsed * 100} %", fg='cyan')
+        return self.pulsed
+
+    def get_errorf(self) -> float:
+        """Return the uncertainty of the frequency."""
+        click.secho(f"Frequency Uncertainty: +/- {self.errorf} Hz", fg='cyan')
+        return self.errorf
+
+    def get_errorp(self) -> float:
+        """Return the uncertainty of the period."""
+        click.secho(f"Period Uncertainty: +/- {self.errorp} s", fg='cyan')
+        return self.errorp
@@ -0,0 +1,136 @@
+#! /usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Other Libraries
+import numpy as np
+from numpy.lib.mixins import NDArrayOperatorsMixin
+
+
+class Grid(NDArrayOperatorsMixin):
+    """
+    A class to represent a uniform frequency grid.
+
+    The frequency of the step k is fmin + (start + k * step) * delta, and it
+    is only calculated when needed, so the grid takes the same memory for
+    any number of steps. Indexing and slicing follow the numpy arrays, and
+    the grid is converted to an array by numpy functions on demand.
+
+    Attributes
+    ----------
+    * `fmin : float`
+    > A float that represents the minimum frequency.
+    * `delta : float`
+    > A float that represents the frequency steps.
+    * `count : int`
+    > An integer that represents the number of steps.
+    * `start : int`
+    > An integer that represents the first step.
+    * `step : int`
+    > An integer that represents the stride between steps.
+
+    Methods
+    -------
+    """
+
+    ndim = 1
+    dtype = np.dtype(np.float64)
+
+    def __init__(self, fmin, delta, count, start=0, step=1) -> None:
+        self.fmin = float(fmin)
+        self.delta = float(delta)
+        self.count = max(int(count), 0)
+        self.start = int(start)
+        self.step = int(step)
+
+    def __repr__(self) -> str:
+        return (f"Grid(fmin={self.fmin}, delta={self.delta}, count={self.count},"
+                f" start={self.start}, step={self.step})")
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self):
+        for index in range(self.count):
+            yield self.fmin + (self.start + index * self.step) * self.delta
+
+    def __array__(self, dtype=None, copy=None) -> np.array:
+        index = np.arange(self.count, dtype=np.float64) * self.step + self.start
+        array = self.fmin + index * self.delta
+        return array if dtype is None else array.astype(dtype)
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        inputs = tuple(
+            np.asarray(value) if isinstance(value, Grid) else value
+            for value in inputs)
+        return getattr(ufunc, method)(*inputs, **kwargs)
+
+    def __getitem__(self, key):
+        if isinstance(key, (int, np.integer)):
+            index = key + self.count if key < 0 else key
+            if not 0 <= index < self.count:
+                raise IndexError(
+                    f"index {key} is out of bounds for grid of size {self.count}")
+            return self.fmin + (self.start + index * self.step) * self.delta
+        if isinstance(key, slice):
+            first, last, stride = key.indices(self.count)
+            return Grid(self.fmin, self.delta, len(range(first, last, stride)),
+                        self.start + first * self.step, self.step * stride)
+        if isinstance(key, tuple) or key is None or key is Ellipsis:
+            return np.asarray(self)[key]
+        key = np.asarray(key)
+        if key.dtype == bool:
+            key = np.flatnonzero(key)
+        if key.size and (np.any(key >= self.count) or np.any(key < -self.count)):
+            raise IndexError(f"index out of bounds for grid of size {self.count}")
+        index = np.where(key < 0, key + self.count, key)
+        return self.fmin + (self.start + index * self.step) * self.delta
+
+    @property
+    def size(self) -> int:
+        """Return the number of steps."""
+        return self.count
+
+    @property
+    def shape(self) -> tuple:
+        """Return the shape of the grid."""
+        return (self.count,)
+
+    def searchsorted(self, value, side='left', sorter=None):
+        """Find the steps where the frequencies keep the grid sorted."""
+        value = np.asarray(value, dtype=np.float64)
+        first = self.fmin + self.start * self.delta
+        width = self.step * self.delta
+        index = np.clip(np.ceil((value - first) / width), 0, self.count)
+        index = index.astype(np.int64)
+        below = np.clip(index - 1, 0, max(self.count - 1, 0))
+        above = np.clip(index, 0, max(self.count - 1, 0))
+        lower = self.fmin + (self.start + below * self.step) * self.delta
+        upper = self.fmin + (self.start + above * self.step) * self.delta
+        if side == 'left':
+            index = np.where((index > 0) & (lower >= value), index - 1, index)
+            index = np.where((index < self.count) & (upper < value), index + 1, index)
+        else:
+            index = np.where((index > 0) & (lower > value), index - 1, index)
+            index = np.where((index < self.count) & (upper <= value), index + 1, index)
+        return index if index.ndim else int(index)
+
+
+def arange(fmin: float, fmax: float, delta: float) -> Grid:
+    """
+    Create the frequency grid from the minimum to the maximum frequency.
+
+    Parameters
+    ----------
+    fmin : float
+        A float that represents the minimum frequency.
+    fmax : float
+        A float that represents the maximum frequency.
+    delta : float
+        A float that represents the frequency steps.
+
+    Returns
+    -------
+    grid : Grid
+        A grid that represents the frequency bins.
+    """
+    return Grid(fmin, delta, max(int(np.ceil((fmax - fmin) / delta)), 0))
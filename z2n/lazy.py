@@ -0,0 +1,51 @@
+#! /usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Generic/Built-in
+import importlib
+
+
+class Module:
+    """
+    A class to represent a module imported on demand.
+
+    The heavy libraries are only needed by some commands, so the module is
+    only imported on the first access to one of its attributes, which keeps
+    the startup of the command line interface fast.
+
+    Attributes
+    ----------
+    * `name : str`
+    > A string that represents the full name of the module.
+
+    Methods
+    -------
+    """
+
+    __slots__ = ('name',)
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def __repr__(self) -> str:
+        return f"Module(name={self.name!r})"
+
+    def __getattr__(self, attribute):
+        return getattr(importlib.import_module(self.name), attribute)
+
+
+def module(name: str) -> Module:
+    """
+    Import a module on the first access to one of its attributes.
+
+    Parameters
+    ----------
+    name : str
+        A string that represents the full name of the module.
+
+    Returns
+    -------
+    module : Module
+        A module that is imported on demand.
+    """
+    return Module(name)
@@ -1,20 +1,22 @@
 #! /usr/bin/python
 # -*- coding: utf-8 -*-
 
+# Generic/Built-in
+import os
+import importlib.util
+
 # Other Libraries
 import click
-import matplotlib
 
 
 def cli() -> None:
     """Entry point to the Z2n Software."""
-    try:
-        matplotlib.use('tkagg')
-    except (ImportError, ModuleNotFoundError):
+    if importlib.util.find_spec('_tkinter') is None:
         click.secho("Failed to use interactive backend.", fg='red')
         click.secho(
             "Check Tkinter dependency: sudo apt-get install python3-tk""", fg='yellow')
     else:
+        os.environ['MPLBACKEND'] = 'tkagg'
         # Owned Libraries
         from z2n import prompt
         prompt.z2n()
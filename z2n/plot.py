@@ -2,18 +2,20 @@
 # -*- coding: utf-8 -*-
 
 # Generic/Built-in
-import psutil
 import pathlib
 
 # Other Libraries
 import click
 import numpy as np
-import matplotlib.pyplot as plt
 
 # Owned Libraries
+from z2n import lazy
 from z2n import stats
+from z2n.grid import arange
 from z2n.series import Series
 
+plt = lazy.module('matplotlib.pyplot')
+
 
 class Plot:
     """
@@ -142,8 +144,15 @@ class Plot:
         flag = 0
         click.secho("The background file is needed.", fg='yellow')
         if not self.noise.set_time():
-            self.noise.bins = np.array(self.data.bins)
+            self.noise.bins = self.data.bins
             self.noise.harmonics = self.data.harmonics
+            self.noise.method = self.data.method
+            self.noise.precision = self.data.precision
+            self.noise.workers = self.data.workers
+            self.noise.tolerance = self.data.tolerance
+            self.noise.binning = self.data.binning
+            self.noise.budget = self.data.budget
+            self.noise.delta = self.data.delta
             plt.close()
             self.noise.z2n = np.zeros(self.noise.bins.size)
             stats.periodogram(self.noise)
@@ -227,18 +236,21 @@ class Plot:
                                 self.data.get_fmax()
                                 self.data.get_delta()
                                 self.data.set_harmonics()
-                                block = (self.data.fmax - self.data.fmin) / \
-                                    np.array(self.data.delta)
-                                nbytes = np.array(
-                                    self.data.delta).dtype.itemsize * block
+                                if click.confirm(
+                                        "\nChange the periodogram options",
+                                        False, prompt_suffix='? '):
+                                    self.data.set_options()
+                                nbytes = stats.cost(self.data, total=arange(
+                                    self.data.fmin, self.data.fmax,
+                                    self.data.delta).size)['peak']
                                 click.secho(
-                                    f"Computation memory {nbytes* 10e-6:.5f} MB",
+                                    f"Computation memory {nbytes * 1e-6:.5f} MB",
                                     fg='yellow')
                                 if click.confirm(
                                         "Run with these values",
                                         True, prompt_suffix='? '):
-                                    if nbytes < psutil.virtual_memory()[1]:
-                                        self.data.bins = np.arange(
+                                    if nbytes < stats.budget(self.data):
+                                        self.data.bins = arange(
                                             self.data.fmin, self.data.fmax,
                                             self.data.delta)
                                         self.data.get_bins()
@@ -2,7 +2,8 @@
 # -*- coding: utf-8 -*-
 
 # Generic/Built-in
-import psutil
+import json
+import functools
 import shelve
 import pathlib
 import threading
@@ -11,15 +12,21 @@ import threading
 import click
 import numpy as np
 from click_shell import shell
-import matplotlib.pyplot as mplt
 
 # Owned Libraries
+from z2n import batch
+from z2n import daemon
 from z2n import file
+from z2n import lazy
 from z2n import stats
 from z2n import __docs__
 from z2n import __version__
+from z2n.grid import arange
 from z2n.plot import Plot
 from z2n.series import Series
+
+mplt = lazy.module('matplotlib.pyplot')
+
 data = Series()
 figure = Plot()
 
@@ -50,8 +57,47 @@ __plt__ = f'''
 @click.option(
     '--format', 'format_', type=click.Choice(['ascii', 'csv', 'fits', 'hdf5']),
     help='Format of the output file.', default='fits', show_default=True)
+@click.option(
+    '--memory', type=float, help='Memory budget of the run (MB).')
+@click.option(
+    '--resume', is_flag=True, help='Resume the run from its checkpoint.')
+@click.option(
+    '--stream', is_flag=True, help='Write the periodogram while it is calculated.')
+@click.option(
+    '--gti', is_flag=True, help='Keep only the events in the good time intervals.')
+@click.option(
+    '--range', 'ranges', type=(str, float, float), multiple=True,
+    help='Keep only the events with a column in a range.')
+@click.option(
+    '--tmax', type=float, help='Maximum time of the events kept (s).')
+@click.option(
+    '--tmin', type=float, help='Minimum time of the events kept (s).')
 @click.option(
     '--ext', type=int, help='FITS extension number.', default=1, show_default=True)
+@click.option(
+    '--workers', type=int, help='Number of worker processes.',
+    default=1, show_default=True)
+@click.option(
+    '--binning', type=float, help='Time resolution of the fft method (s).')
+@click.option(
+    '--tol', type=float, help='Accuracy of the nufft method.',
+    default=1e-9, show_default=True)
+@click.option(
+    '--precision', type=click.Choice(['double', 'single']),
+    help='Floating point precision.', default='double', show_default=True)
+@click.option(
+    '--fap', type=float, help='False alarm probability of the reduced search.')
+@click.option(
+    '--threshold', type=float, help='Power threshold of the reduced search.')
+@click.option(
+    '--peaks', type=int, help='Peaks kept by the adaptive and reduced searches.',
+    default=10, show_default=True)
+@click.option(
+    '--search', type=click.Choice(['full', 'adaptive', 'reduced']),
+    help='Frequency search mode.', default='full', show_default=True)
+@click.option(
+    '--method', type=click.Choice(['direct', 'stepping', 'nufft', 'fft']),
+    help='Method of the periodogram.', default='direct', show_default=True)
 @click.option(
     '--harm', type=int, help='Number of harmonics.', default=1, show_default=True)
 @click.option(
@@ -66,8 +112,10 @@ __plt__ = f'''
 @click.option(
     '--input', 'input_', type=click.Path(exists=True), help='Name of the input file.')
 @shell(prompt=click.style('(z2n) >>> ', fg='blue', bold=True), intro=__z2n__)
-def z2n(input_, output_, format_, fmin, fmax, delta, over,
-        harm, ext, image, title_, xlabel_, ylabel_, docs_):
+def z2n(input_, output_, format_, fmin, fmax, delta, over, harm, method,
+        search, peaks, threshold, fap, precision, tol, binning, workers, ext,
+        tmin, tmax, ranges, gti, stream, resume, memory, image, title_,
+        xlabel_, ylabel_, docs_):
     """
     This program allows the user to calculate periodograms, given a time series,
     using the Z2n statistics a la Buccheri et al. 1983.
@@ -76,6 +124,8 @@ def z2n(input_, output_, format_, fmin, fmax, delta, over,
     the corresponding sinusoidal functions for each time. Be advised that this
     is very computationally expensive if the number of frequency bins is high.
     """
+    if click.get_current_context().invoked_subcommand:
+        return
     mutex = threading.Lock()
     mutex.acquire()
     with shelve.open(f'{pathlib.Path.home()}/.z2n') as database:
@@ -84,7 +134,36 @@ def z2n(input_, output_, format_, fmin, fmax, delta, over,
             click.echo(f"To read the documentation go to {__docs__}")
             exit()
         if input_:
+            if workers > 1 and (stream or search == 'reduced'):
+                raise click.BadParameter(
+                    "The reduced search and the streamed output run on a "
+                    "single process.", param_hint="'--workers'")
+            if resume and (stream or search != 'full'):
+                raise click.BadParameter(
+                    "Only the full search can be resumed.",
+                    param_hint="'--resume'")
+            if stream and search == 'adaptive':
+                raise click.BadParameter(
+                    "The adaptive search can not be streamed.",
+                    param_hint="'--stream'")
             data.harmonics = harm
+            data.method = method
+            data.search = search
+            data.peaks = peaks
+            data.stream = stream
+            if memory:
+                data.budget = int(memory * 1e6)
+            if threshold:
+                data.threshold = threshold
+            if fap:
+                data.fap = fap
+            data.precision = precision
+            data.workers = workers
+            data.tolerance = tol
+            if binning:
+                data.binning = binning
+            data.filters = file.predicates(tmin, tmax, ranges)
+            data.gti = gti
             data.input = input_
             default = "z2n_" + pathlib.Path(data.input).stem
             if output_:
@@ -101,6 +180,8 @@ def z2n(input_, output_, format_, fmin, fmax, delta, over,
                 data.get_exposure()
                 data.get_sampling()
                 data.get_nyquist()
+                if data.filters or data.gti:
+                    data.get_filters()
                 if not fmin:
                     data.fmin = data.nyquist
                 else:
@@ -126,17 +207,65 @@ def z2n(input_, output_, format_, fmin, fmax, delta, over,
                 data.get_fmax()
                 data.get_delta()
                 data.get_harmonics()
-                block = (data.fmax - data.fmin) / np.array(data.delta)
-                nbytes = np.array(data.delta).dtype.itemsize * block
+                data.get_method()
+                data.get_search()
+                if data.search != 'full':
+                    data.get_peaks()
+                if data.search == 'reduced':
+                    if data.threshold:
+                        data.get_threshold()
+                    if data.fap:
+                        data.get_fap()
+                data.get_precision()
+                if data.workers > 1:
+                    data.get_workers()
+                if data.method == 'nufft':
+                    data.get_tolerance()
+                usage = stats.cost(
+                    data, stats.fitting(data, data.method, 2 ** 14))
+                if data.search == 'full' and not data.stream and (
+                        usage['peak'] >= stats.budget(data)):
+                    if data.workers > 1 or resume:
+                        click.secho(
+                            "Streaming needs a single process without --resume.",
+                            fg='yellow')
+                    else:
+                        click.secho(
+                            "Streaming the periodogram to fit the memory budget.",
+                            fg='yellow')
+                        data.stream = True
+                        usage = stats.cost(
+                            data, stats.fitting(data, data.method, 2 ** 14))
                 click.secho(
-                    f"Computation memory {nbytes* 10e-6:.5f} MB", fg='yellow')
-                if nbytes < psutil.virtual_memory()[1]:
-                    data.bins = np.arange(data.fmin, data.fmax, data.delta)
-                    data.get_bins()
-                    data.time = np.array(data.time)
-                    data.bins = np.array(data.bins)
-                    data.z2n = np.zeros(data.bins.size)
-                    stats.periodogram(data)
+                    f"Computation memory {usage['peak'] * 1e-6:.5f} MB", fg='yellow')
+                if data.budget:
+                    data.get_budget()
+                if usage['peak'] < stats.budget(data):
+                    if data.stream:
+                        flag = 1
+                        while flag:
+                            if pathlib.Path(file.filename(data)).is_file():
+                                click.secho("File already exists.", fg='red')
+                                data.output = click.prompt(
+                                    "Name of the file", default, type=click.Path())
+                            else:
+                                flag = 0
+                        stream = file.open_stream(data, stats.steps(data))
+                        stats.reduced(data, data.peaks, stream=functools.partial(
+                            file.save_chunk, data, stream))
+                    elif data.search == 'adaptive':
+                        stats.adaptive(data, data.peaks)
+                        data.get_bins()
+                    elif data.search == 'reduced':
+                        stats.reduced(data, data.peaks)
+                        data.get_bins()
+                    else:
+                        data.bins = arange(data.fmin, data.fmax, data.delta)
+                        data.get_bins()
+                        data.z2n = np.zeros(data.bins.size)
+                        data.set_checkpoint(resume)
+                        data.get_checkpoint()
+                        stats.periodogram(data)
                     click.secho('Periodogram calculated.', fg='green')
                     click.secho(
                         "Values based on the global maximum.", fg='yellow')
@@ -148,49 +277,57 @@ def z2n(input_, output_, format_, fmin, fmax, delta, over,
                     data.get_frequency()
                     data.get_period()
                     data.get_pfraction()
-                    flag = 1
-                    while flag:
-                        if pathlib.Path(f"{data.output}.{data.format}").is_file():
-                            click.secho("File already exists.", fg='red')
-                            data.output = click.prompt(
-                                "Name of the file", default, type=click.Path())
-                        else:
-                            flag = 0
-                    if data.format == 'ascii':
-                        file.save_ascii(data)
-                    elif data.format == 'csv':
-                        file.save_csv(data)
-                    elif data.format == 'fits':
-                        file.save_fits(data)
-                    elif data.format == 'hdf5':
-                        file.save_hdf5(data)
-                    click.secho(
-                        f"File saved at {data.output}.{data.format}", fg='green')
-                    flag = 1
-                    while flag:
-                        if pathlib.Path(f"{data.output}.{image}").is_file():
-                            click.secho("Image already exists.", fg='red')
-                            data.output = click.prompt(
-                                "Name of the image", default, type=click.Path())
-                        else:
-                            flag = 0
-                    mplt.plot(
-                        data.bins, data.z2n, label='Z2n Power', linewidth=2)
-                    mplt.title(title_)
-                    mplt.xlabel(xlabel_)
-                    mplt.ylabel(ylabel_)
-                    mplt.legend(loc='best')
-                    mplt.tight_layout()
-                    if image == 'png':
-                        mplt.savefig(f'{data.output}.{image}', format=image)
-                    elif image == 'pdf':
-                        mplt.savefig(f'{data.output}.{image}', format=image)
-                    elif image == 'ps':
-                        mplt.savefig(f'{data.output}.{image}', format=image)
-                    elif image == 'eps':
-                        mplt.savefig(f'{data.output}.{image}', format=image)
-                    click.secho(
-                        f"Image saved at {data.output}.{image}", fg='green')
+                    if data.stream:
+                        file.close_stream(data, stream)
+                        click.secho(
+                            f"File saved at {file.filename(data)}", fg='green')
+                        click.secho(
+                            "Image is not saved for streamed periodograms.",
+                            fg='yellow')
+                    else:
+                        flag = 1
+                        while flag:
+                            if pathlib.Path(file.filename(data)).is_file():
+                                click.secho("File already exists.", fg='red')
+                                data.output = click.prompt(
+                                    "Name of the file", default, type=click.Path())
+                            else:
+                                flag = 0
+                        if data.format == 'ascii':
+                            file.save_ascii(data)
+                        elif data.format == 'csv':
+                            file.save_csv(data)
+                        elif data.format == 'fits':
+                            file.save_fits(data)
+                        elif data.format == 'hdf5':
+                            file.save_hdf5(data)
+                        click.secho(
+                            f"File saved at {file.filename(data)}", fg='green')
+                        flag = 1
+                        while flag:
+                            if pathlib.Path(f"{data.output}.{image}").is_file():
+                                click.secho("Image already exists.", fg='red')
+                                data.output = click.prompt(
+                                    "Name of the image", default, type=click.Path())
+                            else:
+                                flag = 0
+                        mplt.plot(
+                            data.bins, data.z2n, label='Z2n Power', linewidth=2)
+                        mplt.title(title_)
+                        mplt.xlabel(xlabel_)
+                        mplt.ylabel(ylabel_)
+                        mplt.legend(loc='best')
+                        mplt.tight_layout()
+                        if image == 'png':
+                            mplt.savefig(f'{data.output}.{image}', format=image)
+                        elif image == 'pdf':
+                            mplt.savefig(f'{data.output}.{image}', format=image)
+                        elif image == 'ps':
+                            mplt.savefig(f'{data.output}.{image}', format=image)
+                        elif image == 'eps':
+                            mplt.savefig(f'{data.output}.{image}', format=image)
+                        click.secho(
+                            f"Image saved at {data.output}.{image}", fg='green')
                 else:
                     click.secho("Not enough memory available.", fg='red')
             exit()
@@ -256,6 +393,403 @@ def save() -> None:
         figure.data.save_file()
 
 
+@z2n.command()
+@click.option(
+    '--shards', type=int, required=True, help='Number of frequency shards.')
+@click.option(
+    '--gti', is_flag=True, help='Keep only the events in the good time intervals.')
+@click.option(
+    '--range', 'ranges', type=(str, float, float), multiple=True,
+    help='Keep only the events with a column in a range.')
+@click.option(
+    '--tmax', type=float, help='Maximum time of the events kept (s).')
+@click.option(
+    '--tmin', type=float, help='Minimum time of the events kept (s).')
+@click.option(
+    '--ext', type=int, help='FITS extension number.', default=1, show_default=True)
+@click.option(
+    '--binning', type=float, help='Time resolution of the fft method (s).')
+@click.option(
+    '--tol', type=float, help='Accuracy of the nufft method.',
+    default=1e-9, show_default=True)
+@click.option(
+    '--precision', type=click.Choice(['double', 'single']),
+    help='Floating point precision.', default='double', show_default=True)
+@click.option(
+    '--method', type=click.Choice(['direct', 'stepping', 'nufft', 'fft']),
+    help='Method of the periodogram.', default='direct', show_default=True)
+@click.option(
+    '--harm', type=int, help='Number of harmonics.', default=1, show_default=True)
+@click.option(
+    '--over', type=int, help='Oversample factor instead of steps.')
+@click.option(
+    '--delta', type=float, help='Frequency steps on the spectrum (Hz).')
+@click.option(
+    '--fmax', type=float, required=True,
+    help='Maximum frequency on the spectrum (Hz).')
+@click.option(
+    '--fmin', type=float, help='Minimum frequency on the spectrum (Hz).')
+@click.option('--output', 'output_', type=click.Path(), help='Prefix of the shard files.')
+@click.option(
+    '--input', 'input_', type=click.Path(exists=True), required=True,
+    help='Name of the input file.')
+def split(input_, output_, fmin, fmax, delta, over, harm, method,
+          precision, tol, binning, ext, tmin, tmax, ranges, gti, shards) -> None:
+    """Split the periodogram in frequency shards."""
+    series = Series()
+    series.input = input_
+    series.filters = file.predicates(tmin, tmax, ranges)
+    series.gti = gti
+    if not file.load_events(series, ext):
+        series.set_exposure()
+        series.set_sampling()
+        series.set_nyquist()
+        series.fmin = fmin if fmin else series.nyquist
+        if over:
+            series.delta = 1 / (over * series.exposure)
+        elif delta:
+            series.delta = delta
+        else:
+            click.secho("The frequency steps are needed.", fg='red')
+            return
+        series.fmax = fmax
+        grid = arange(series.fmin, series.fmax, series.delta)
+        total = grid.size
+        if not binning and method == 'fft' and total:
+            binning = stats.resolution(grid[-1], harm)
+        prefix = output_ if output_ else "z2n_" + pathlib.Path(input_).stem
+        for index in range(shards):
+            start = index * total // shards
+            count = (index + 1) * total // shards - start
+            spec = {
+                'input': input_,
+                'ext': ext,
+                'fmin': series.fmin,
+                'fmax': series.fmax,
+                'delta': series.delta,
+                'total': total,
+                'harmonics': harm,
+                'method': method,
+                'precision': precision,
+                'tolerance': tol,
+                'binning': binning if binning else 0,
+                'filters': series.filters,
+                'gti': gti,
+                'index': index,
+                'shards': shards,
+                'start': start,
+                'count': count,
+                'partial': f"{prefix}_{index}.hdf5",
+            }
+            with open(f"{prefix}_{index}.json", 'w') as handle:
+                json.dump(spec, handle, indent=4)
+        click.secho(f"{total} steps.", fg='cyan')
+        click.secho(f"Shards saved at {prefix}_*.json", fg='green')
+
+
+@z2n.command()
+@click.option(
+    '--workers', type=int, help='Number of worker processes.',
+    default=1, show_default=True)
+@click.argument('spec', type=click.Path(exists=True))
+def shard(spec, workers) -> None:
+    """Calculate the periodogram of a frequency shard."""
+    with open(spec) as handle:
+        spec = json.load(handle)
+    series = Series()
+    series.input = spec['input']
+    series.harmonics = spec['harmonics']
+    series.method = spec['method']
+    series.precision = spec['precision']
+    series.tolerance = spec['tolerance']
+    series.binning = spec['binning']
+    series.filters = spec.get('filters', {})
+    series.gti = spec.get('gti', False)
+    series.workers = workers
+    if not file.load_events(series, spec['ext']):
+        series.set_exposure()
+        series.set_sampling()
+        series.set_nyquist()
+        series.fmin = spec['fmin']
+        series.fmax = spec['fmax']
+        series.delta = spec['delta']
+        series.bins = arange(series.fmin, series.fmax, series.delta)[
+            spec['start']:spec['start'] + spec['count']]
+        series.z2n = np.zeros(series.bins.size)
+        if series.bins.size:
+            stats.periodogram(series)
+        file.save_shard(series, spec)
+        click.secho(f"Partial saved at {spec['partial']}", fg='green')
+
+
+@z2n.command()
+@click.option(
+    '--format', 'format_', type=click.Choice(['ascii', 'csv', 'fits', 'hdf5']),
+    help='Format of the output file.', default='fits', show_default=True)
+@click.option('--output', 'output_', type=click.Path(), help='Name of the output file.')
+@click.argument('partials', nargs=-1, required=True, type=click.Path(exists=True))
+def merge(partials, output_, format_) -> None:
+    """Merge the partial periodograms of the frequency shards."""
+    shards = sorted(
+        (file.load_shard(partial) for partial in partials),
+        key=lambda partial: partial['start'])
+    first = shards[0]
+    expected = 0
+    for partial in shards:
+        if any(partial[key] != first[key] for key in (
+                'input', 'ext', 'fmin', 'fmax', 'delta', 'total', 'harmonics',
+                'shards', 'events')) or any(
+                    partial.get(key) != first.get(key) for key in (
+                        'method', 'precision', 'tolerance', 'binning',
+                        'filters', 'gti')):
+            click.secho(
+                f"Partial {partial['path']} is from another grid.", fg='red')
+            return
+        if partial['bins'].size != partial['count'] or (partial['count'] and (
+                not np.isclose(partial['bins'][0], partial['fmin']
+                               + partial['start'] * partial['delta'],
+                               rtol=0, atol=partial['delta'] * 1e-3))):
+            click.secho(
+                f"Partial {partial['path']} does not match its grid.", fg='red')
+            return
+        if partial['start'] > expected:
+            click.secho(
+                f"Missing steps {expected} to {partial['start'] - 1}.", fg='red')
+            return
+        if partial['start'] < expected:
+            click.secho(
+                f"Partial {partial['path']} overlaps another shard.", fg='red')
+            return
+        expected = partial['start'] + partial['count']
+    if expected != first['total']:
+        click.secho(
+            f"Missing steps {expected} to {first['total'] - 1}.", fg='red')
+        return
+    data.input = first['input']
+    data.filters = json.loads(first.get('filters', '{}'))
+    data.gti = bool(first.get('gti', False))
+    data.exposure = first['exposure']
+    data.sampling = first['sampling']
+    data.nyquist = first['nyquist']
+    data.harmonics = int(first['harmonics'])
+    data.fmin = first['fmin']
+    data.fmax = first['fmax']
+    data.delta = first['delta']
+    data.bins = np.concatenate([partial['bins'] for partial in shards])
+    data.z2n = np.concatenate([partial['z2n'] for partial in shards])
+    click.secho(f"{first['events']} events.", fg='cyan')
+    data.get_bins()
+    data.set_power()
+    data.set_frequency()
+    data.set_period()
+    data.pulsed = ((2 * data.power) / first['events']) ** 0.5
+    data.get_power()
+    data.get_frequency()
+    data.get_period()
+    data.get_pfraction()
+    default = "z2n_" + pathlib.Path(data.input).stem
+    data.output = output_ if output_ else default
+    data.format = format_
+    flag = 1
+    while flag:
+        if pathlib.Path(file.filename(data)).is_file():
+            click.secho("File already exists.", fg='red')
+            data.output = click.prompt(
+                "Name of the file", default, type=click.Path())
+        else:
+            flag = 0
+    if data.format == 'ascii':
+        file.save_ascii(data)
+    elif data.format == 'csv':
+        file.save_csv(data)
+    elif data.format == 'fits':
+        file.save_fits(data, int(first['events']))
+    elif data.format == 'hdf5':
+        file.save_hdf5(data)
+    click.secho(f"File saved at {file.filename(data)}", fg='green')
+
+
+@z2n.command('batch')
+@click.option(
+    '--summary', type=click.Path(), help='Name of the summary file.')
+@click.option(
+    '--threads', type=int, help='Number of loading threads.',
+    default=4, show_default=True)
+@click.option(
+    '--workers', type=int, help='Number of worker processes.',
+    default=1, show_default=True)
+@click.option(
+    '--format', 'format_', type=click.Choice(['ascii', 'csv', 'fits', 'hdf5']),
+    help='Format of the output files.', default='fits', show_default=True)
+@click.option(
+    '--gti', is_flag=True, help='Keep only the events in the good time intervals.')
+@click.option(
+    '--range', 'ranges', type=(str, float, float), multiple=True,
+    help='Keep only the events with a column in a range.')
+@click.option(
+    '--tmax', type=float, help='Maximum time of the events kept (s).')
+@click.option(
+    '--tmin', type=float, help='Minimum time of the events kept (s).')
+@click.option(
+    '--ext', type=int, help='FITS extension number.', default=1, show_default=True)
+@click.option(
+    '--binning', type=float, help='Time resolution of the fft method (s).')
+@click.option(
+    '--tol', type=float, help='Accuracy of the nufft method.',
+    default=1e-9, show_default=True)
+@click.option(
+    '--precision', type=click.Choice(['double', 'single']),
+    help='Floating point precision.', default='double', show_default=True)
+@click.option(
+    '--method', type=click.Choice(['direct', 'stepping', 'nufft', 'fft']),
+    help='Method of the periodogram.', default='direct', show_default=True)
+@click.option(
+    '--harm', type=int, help='Number of harmonics.', default=1, show_default=True)
+@click.option(
+    '--over', type=int, help='Oversample factor instead of steps.')
+@click.option(
+    '--delta', type=float, help='Frequency steps on the spectrum (Hz).')
+@click.option(
+    '--fmax', type=float, help='Maximum frequency on the spectrum (Hz).')
+@click.option(
+    '--fmin', type=float, help='Minimum frequency on the spectrum (Hz).')
+@click.option(
+    '--folder', type=click.Path(file_okay=False), help='Folder of the output files.',
+    default='.', show_default=True)
+@click.option(
+    '--manifest', type=click.Path(exists=True),
+    help='CSV file with an input column and per file parameters.')
+@click.argument('inputs', nargs=-1)
+def batch_(inputs, manifest, folder, fmin, fmax, delta, over, harm, method,
+           precision, tol, binning, ext, tmin, tmax, ranges, gti, format_,
+           workers, threads, summary) -> None:
+    """Calculate the periodograms of many event files."""
+    shared = {
+        'fmin': fmin, 'fmax': fmax, 'delta': delta, 'over': over,
+        'harm': harm, 'method': method, 'precision': precision, 'tol': tol,
+        'binning': binning, 'ext': ext, 'format': format_,
+        'filters': file.predicates(tmin, tmax, ranges), 'gti': gti}
+    jobs = batch.specs(inputs, manifest, shared)
+    if not jobs:
+        click.secho("No event files given.", fg='red')
+        exit(1)
+    batch.outputs(jobs, folder)
+    repeated = batch.clashes(jobs)
+    if repeated:
+        for path in repeated:
+            click.secho(f"Output file {path} is shared by jobs.", fg='red')
+        exit(1)
+    pathlib.Path(folder).mkdir(parents=True, exist_ok=True)
+    summary = summary if summary else str(pathlib.Path(folder) / "z2n_summary.csv")
+    click.secho(f"{len(jobs)} event files.", fg='cyan')
+    failed = batch.run(jobs, summary, threads, workers)
+    click.secho(f"\nSummary saved at {summary}", fg='green')
+    if failed:
+        click.secho(f"{failed} of {len(jobs)} jobs failed.", fg='red')
+        exit(1)
+
+
+@z2n.command()
+@click.option(
+    '--workers', type=int, help='Number of worker processes.',
+    default=1, show_default=True)
+@click.option(
+    '--cache', type=int, help='Event files kept in memory.',
+    default=0, show_default=True)
+@click.option(
+    '--socket', 'socket_', type=click.Path(), help='Path of the Unix socket.',
+    default=daemon.SOCKET, show_default=True)
+def serve(socket_, cache, workers) -> None:
+    """Serve periodogram jobs from a warm process."""
+    daemon.serve(socket_, cache, workers)
+
+
+@z2n.command()
+@click.option('--stop', is_flag=True, help='Stop the daemon.')
+@click.option(
+    '--socket', 'socket_', type=click.Path(), help='Path of the Unix socket.',
+    default=daemon.SOCKET, show_default=True)
+@click.option(
+    '--format', 'format_', type=click.Choice(['ascii', 'csv', 'fits', 'hdf5']),
+    help='Format of the output file.', default='fits', show_default=True)
+@click.option(
+    '--gti', is_flag=True, help='Keep only the events in the good time intervals.')
+@click.option(
+    '--range', 'ranges', type=(str, float, float), multiple=True,
+    help='Keep only the events with a column in a range.')
+@click.option(
+    '--tmax', type=float, help='Maximum time of the events kept (s).')
+@click.option(
+    '--tmin', type=float, help='Minimum time of the events kept (s).')
+@click.option(
+    '--ext', type=int, help='FITS extension number.', default=1, show_default=True)
+@click.option(
+    '--binning', type=float, help='Time resolution of the fft method (s).')
+@click.option(
+    '--tol', type=float, help='Accuracy of the nufft method.',
+    default=1e-9, show_default=True)
+@click.option(
+    '--precision', type=click.Choice(['double', 'single']),
+    help='Floating point precision.', default='double', show_default=True)
+@click.option(
+    '--method', type=click.Choice(['direct', 'stepping', 'nufft', 'fft']),
+    help='Method of the periodogram.', default='direct', show_default=True)
+@click.option(
+    '--harm', type=int, help='Number of harmonics.', default=1, show_default=True)
+@click.option(
+    '--over', type=int, help='Oversample factor instead of steps.')
+@click.option(
+    '--delta', type=float, help='Frequency steps on the spectrum (Hz).')
+@click.option(
+    '--fmax', type=float, help='Maximum frequency on the spectrum (Hz).')
+@click.option(
+    '--fmin', type=float, help='Minimum frequency on the spectrum (Hz).')
+@click.option('--output', 'output_', type=click.Path(), help='Name of the output file.')
+@click.option(
+    '--input', 'input_', type=click.Path(exists=True), help='Name of the input file.')
+def submit(input_, output_, fmin, fmax, delta, over, harm, method, precision,
+           tol, binning, ext, tmin, tmax, ranges, gti, format_, socket_,
+           stop) -> None:
+    """Send a periodogram job to the daemon."""
+    if stop:
+        spec = {'action': 'stop'}
+    elif not input_:
+        click.secho("The input file is needed.", fg='red')
+        return
+    else:
+        output_ = output_ if output_ else "z2n_" + pathlib.Path(input_).stem
+        spec = {
+            'input': str(pathlib.Path(input_).resolve()),
+            'output': str(pathlib.Path(output_).resolve()),
+            'ext': ext,
+            'fmin': fmin,
+            'fmax': fmax,
+            'delta': delta,
+            'over': over,
+            'harm': harm,
+            'method': method,
+            'precision': precision,
+            'tol': tol,
+            'binning': binning,
+            'filters': file.predicates(tmin, tmax, ranges),
+            'gti': gti,
+            'format': format_,
+        }
+    result = daemon.submit(spec, socket_)
+    if 'error' in result:
+        click.secho(result['error'], fg='red')
+        exit(1)
+    elif 'output' in result:
+        click.secho(f"{result['steps']} steps.", fg='cyan')
+        click.secho(f"Peak power: {result['power']}", fg='cyan')
+        click.secho(f"Peak frequency: {result['frequency']} Hz", fg='cyan')
+        click.secho(f"Peak period: {result['period']} s", fg='cyan')
+        click.secho(f"Pulsed fraction: {result['pulsed'] * 100} %", fg='cyan')
+        click.secho(f"File saved at {result['output']}", fg='green')
+    else:
+        click.secho("Daemon stopped.", fg='yellow')
+
+
 @shell(prompt=click.style('(plt) >>> ', fg='magenta', bold=True), intro=__plt__)
 def plt() -> None:
     """Open the interactive periodogram plotting window."""
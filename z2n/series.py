@@ -3,55 +3,116 @@
 
 # Generic/Built-in
 import sys
-import copy
-import psutil
+import hashlib
 import pathlib
 import tempfile
 
 # Other Libraries
-import h5py
 import click
-import termtables
 import numpy as np
-import matplotlib.pyplot as plt
 
 # Owned Libraries
 from z2n import file
+from z2n import lazy
 from z2n import stats
+from z2n.fit import Fit
+from z2n.grid import Grid
+from z2n.grid import arange
+
+h5py = lazy.module('h5py')
+termtables = lazy.module('termtables')
+plt = lazy.module('matplotlib.pyplot')
+
+
+def buffer(values) -> np.array:
+    """
+    Return the values as a contiguous array of double precision.
+
+    Contiguous arrays and memory maps of double precision are returned
+    as they are, every other sequence is copied once.
+
+    Parameters
+    ----------
+    values : np.array
+        An array, a memory map or a sequence of values.
+
+    Returns
+    -------
+    values : np.array
+        An array that represents the values.
+    """
+    if isinstance(values, Grid):
+        return values
+    if isinstance(values, np.ndarray) and values.dtype == np.float64 and (
+            values.flags.c_contiguous):
+        return values
+    return np.ascontiguousarray(values, dtype=np.float64)
 
 
 class Series:
     """
     A class to represent a time series object.
 
+    The times, the frequency bins and the periodogram are always contiguous
+    arrays of double precision, in memory or memory mapped, and are handed
+    to the kernels without copies.
+
     Attributes
     ----------
     * `bak : str`
     > A string that represents the backup file path.
+    * `checkpoint : h5py.File`
+    > An open hdf5 file that keeps the progress of the run, empty if none.
     * `gauss : str`
-    > A series object that represents the gaussian fit.
+    > A fit object that represents the gaussian fit.
     * `input : str`
     > A string that represents the input file path.
     * `output : str`
     > A string that represents the output file name.
     * `format : str`
     > A string that represents the file format.
+    * `method : str`
+    > A string that represents the periodogram method.
+    * `precision : str`
+    > A string that represents the floating point precision.
+    * `search : str`
+    > A string that represents the frequency search mode.
+    * `stream : bool`
+    > A boolean that represents if the periodogram is written while calculated.
     * `time : np.array`
     > An arrray that represents the time series.
     * `bins : np.array`
-    > An arrray that represents the frequency bins.
+    > An arrray or a grid that represents the frequency bins.
     * `z2n : np.array`
     > An arrray that represents the periodogram.
     * `harmonics : int`
     > An integer that represents the number of harmonics.
     * `oversample : int`
     > An integer that represents the oversample factor.
+    * `workers : int`
+    > An integer that represents the number of worker processes.
+    * `budget : int`
+    > An integer that represents the memory budget in bytes.
+    * `peaks : int`
+    > An integer that represents the peaks kept by the adaptive and reduced searches.
+    * `filters : dict`
+    > A dictionary with the range of each filtered column, read with the events.
+    * `gti : bool`
+    > A boolean that represents keeping only the events in the good time intervals.
     * `fmin : float`
     > A float that represents the minimum frequency.
     * `fmax : float`
     > A float that represents the maximum frequency.
     * `delta : float`
     > A float that represents the frequency steps.
+    * `tolerance : float`
+    > A float that represents the accuracy of the nufft method.
+    * `binning : float`
+    > A float that represents the time resolution of the fft method.
+    * `threshold : float`
+    > A float that represents the power threshold of the reduced search.
+    * `fap : float`
+    > A float that represents the false alarm probability of the reduced search.
     * `nyquist : float`
     > A float that represents the nyquist frequency.
     * `exposure : float`
@@ -75,21 +136,43 @@ class Series:
     -------
     """
 
+    __slots__ = (
+        'bak', 'checkpoint', 'gauss', 'input', 'output', 'format', 'method',
+        'precision', 'search', 'stream', '_time', '_bins', '_z2n', 'fmin',
+        'fmax', 'delta', 'tolerance', 'binning', 'threshold', 'fap', 'nyquist',
+        'harmonics', 'oversample', 'workers', 'budget', 'peaks', 'filters',
+        'gti', 'exposure', 'sampling', 'power', 'frequency', 'errorf',
+        'period', 'errorp', 'pulsed')
+
     def __init__(self) -> None:
         self.bak = ""
+        self.checkpoint = ""
         self.gauss = ""
         self.input = ""
         self.output = ""
         self.format = ""
+        self.method = "direct"
+        self.precision = "double"
+        self.search = "full"
+        self.stream = False
         self.time = np.array([])
         self.bins = np.array([])
         self.z2n = np.array([])
         self.fmin = 0
         self.fmax = 0
         self.delta = 0
+        self.tolerance = 1e-9
+        self.binning = 0
+        self.threshold = 0
+        self.fap = 0
         self.nyquist = 0
         self.harmonics = 0
         self.oversample = 0
+        self.workers = 1
+        self.budget = 0
+        self.peaks = 10
+        self.filters = {}
+        self.gti = False
         self.exposure = 0
         self.sampling = 0
         self.power = 0
@@ -99,13 +182,40 @@ class Series:
         self.errorp = 0
         self.pulsed = 0
 
+    @property
+    def time(self) -> np.array:
+        """Return the array of the time series."""
+        return self._time
+
+    @time.setter
+    def time(self, values) -> None:
+        self._time = buffer(values)
+
+    @property
+    def bins(self) -> np.array:
+        """Return the array or the grid of the frequency bins."""
+        return self._bins
+
+    @bins.setter
+    def bins(self, values) -> None:
+        self._bins = buffer(values)
+
+    @property
+    def z2n(self) -> np.array:
+        """Return the array of the periodogram."""
+        return self._z2n
+
+    @z2n.setter
+    def z2n(self, values) -> None:
+        self._z2n = buffer(values)
+
     def get_gauss(self) -> str:
-        """Return the gaussian series object."""
+        """Return the gaussian fit object."""
         return self.gauss
 
     def set_gauss(self) -> None:
-        """Copy the gaussian series object."""
-        self.gauss = copy.deepcopy(self)
+        """Change the gaussian fit object."""
+        self.gauss = Fit(self)
 
     def get_bak(self) -> str:
         """Return the backup file path."""
@@ -116,16 +226,52 @@ class Series:
         """Change the backup file path."""
         self.bak = tempfile.NamedTemporaryFile(
             suffix='.z2n', delete=False).name
-        self.bak = h5py.File(self.bak, 'a')
-        self.bak.create_dataset('TIME', data=self.time, compression='lzf')
-        self.bak.create_dataset('BINS', data=self.bins, compression='lzf')
-        self.bak.create_dataset('Z2N', data=self.z2n, compression='lzf')
-        del self.time
-        del self.bins
-        del self.z2n
-        self.time = self.bak['TIME']
-        self.bins = self.bak['BINS']
-        self.z2n = self.bak['Z2N']
+        arrays = {'TIME': self.time, 'Z2N': self.z2n}
+        if not isinstance(self.bins, Grid):
+            arrays['BINS'] = self.bins
+        offsets = {}
+        with h5py.File(self.bak, 'w') as bak:
+            for key, values in arrays.items():
+                bak.create_dataset(key, data=values)
+                offsets[key] = bak[key].id.get_offset()
+        for key, values in arrays.items():
+            if values.size:
+                arrays[key] = np.memmap(
+                    self.bak, dtype=np.float64, mode='r+',
+                    offset=offsets[key], shape=values.shape)
+        self.time = arrays['TIME']
+        self.z2n = arrays['Z2N']
+        if 'BINS' in arrays:
+            self.bins = arrays['BINS']
+
+    def get_checkpoint(self) -> str:
+        """Return the checkpoint file path."""
+        click.secho(f"Path of the checkpoint: {self.checkpoint.filename}", fg='cyan')
+        return self.checkpoint.filename
+
+    def set_checkpoint(self, resume=False) -> None:
+        """Change the checkpoint file path."""
+        digest = hashlib.sha256()
+        digest.update(memoryview(np.ascontiguousarray(self.time)))
+        if isinstance(self.bins, Grid):
+            digest.update(repr((
+                self.bins.fmin, self.bins.delta, self.bins.count,
+                self.bins.start, self.bins.step)).encode())
+        else:
+            digest.update(memoryview(np.ascontiguousarray(self.bins)))
+        digest.update(repr((
+            self.harmonics, self.method, self.precision, self.tolerance,
+            self.binning)).encode())
+        digest = digest.hexdigest()
+        path = pathlib.Path(tempfile.gettempdir()) / f'z2n_{digest[:16]}.z2n'
+        if path.is_file() and not resume:
+            path.unlink()
+        self.checkpoint = h5py.File(path, 'a')
+        if self.checkpoint.attrs.get('digest', digest) != digest:
+            self.checkpoint.close()
+            path.unlink()
+            self.checkpoint = h5py.File(path, 'a')
+        self.checkpoint.attrs['digest'] = digest
 
     def get_input(self) -> str:
         """Return the input file path."""
@@ -149,7 +295,7 @@ class Series:
         while flag:
             self.output = click.prompt(
                 "\nName of the file", default, type=click.Path())
-            if pathlib.Path(f"{self.output}.{self.format}").is_file():
+            if pathlib.Path(file.filename(self)).is_file():
                 click.secho("File already exists.", fg='red')
             else:
                 flag = 0
@@ -164,6 +310,77 @@ class Series:
         self.format = click.prompt(
             "\nFormat", "fits", type=click.Choice(['ascii', 'csv', 'fits', 'hdf5']))
 
+    def get_method(self) -> str:
+        """Return the periodogram method."""
+        click.secho(f"Periodogram method: {self.method}", fg='cyan')
+        return self.method
+
+    def set_method(self) -> None:
+        """Change the periodogram method."""
+        self.method = click.prompt(
+            "\nMethod", self.method,
+            type=click.Choice(['direct', 'stepping', 'nufft', 'fft']))
+
+    def get_precision(self) -> str:
+        """Return the floating point precision."""
+        click.secho(f"Precision: {self.precision}", fg='cyan')
+        return self.precision
+
+    def set_precision(self) -> None:
+        """Change the floating point precision."""
+        self.precision = click.prompt(
+            "\nPrecision", self.precision,
+            type=click.Choice(['double', 'single']))
+
+    def get_search(self) -> str:
+        """Return the frequency search mode."""
+        click.secho(f"Frequency search: {self.search}", fg='cyan')
+        return self.search
+
+    def set_search(self) -> None:
+        """Change the frequency search mode."""
+        self.search = click.prompt(
+            "\nSearch", self.search,
+            type=click.Choice(['full', 'adaptive', 'reduced']))
+
+    def get_options(self) -> None:
+        """Return the options of the periodogram."""
+        self.get_method()
+        if self.method == 'nufft':
+            self.get_tolerance()
+        if self.method == 'fft' and self.binning:
+            self.get_binning()
+        self.get_precision()
+        self.get_search()
+        if self.search != 'full':
+            self.get_peaks()
+        if self.search == 'reduced':
+            self.get_threshold()
+            self.get_fap()
+        self.get_workers()
+        self.get_budget()
+
+    def set_options(self) -> None:
+        """Change the options of the periodogram."""
+        self.set_method()
+        if self.method == 'nufft':
+            self.set_tolerance()
+        if self.method == 'fft':
+            self.set_binning()
+        if self.method == 'direct':
+            self.set_precision()
+        self.set_search()
+        if self.search != 'full':
+            self.set_peaks()
+        if self.search == 'reduced':
+            self.set_threshold()
+            self.set_fap()
+            self.workers = 1
+        else:
+            self.set_workers()
+        self.set_budget()
+        self.get_options()
+
     def get_time(self) -> np.array:
         """Return the time series."""
         click.secho(f"{self.time.size} events.", fg='cyan')
@@ -173,6 +390,10 @@ class Series:
         """Change the time series."""
         flag = 0
         self.set_input()
+        self.filters = {}
+        while click.confirm(
+                "\nFilter the events by a column", False, prompt_suffix='? '):
+            self.set_filters()
         if not file.load_file(self, 0):
             click.secho('Event file loaded.', fg='green')
             self.set_exposure()
@@ -182,6 +403,8 @@ class Series:
             self.get_exposure()
             self.get_sampling()
             self.get_nyquist()
+            if self.filters:
+                self.get_filters()
         else:
             flag = 1
         return flag
@@ -212,13 +435,16 @@ class Series:
             self.get_fmax()
             self.get_delta()
             self.set_harmonics()
-            block = (self.fmax - self.fmin) / np.array(self.delta)
-            nbytes = np.array(self.delta).dtype.itemsize * block
+            if click.confirm(
+                    "\nChange the periodogram options", False, prompt_suffix='? '):
+                self.set_options()
+            nbytes = stats.cost(self, total=arange(
+                self.fmin, self.fmax, self.delta).size)['peak']
             click.secho(
-                f"Computation memory {nbytes* 10e-6:.5f} MB", fg='yellow')
+                f"Computation memory {nbytes * 1e-6:.5f} MB", fg='yellow')
             if click.confirm("\nRun with these values", True, prompt_suffix='? '):
-                if nbytes < psutil.virtual_memory()[1]:
-                    self.bins = np.arange(self.fmin, self.fmax, self.delta)
+                if nbytes < stats.budget(self):
+                    self.bins = arange(self.fmin, self.fmax, self.delta)
                     self.get_bins()
                     flag = 0
                 else:
@@ -233,10 +459,13 @@ class Series:
     def set_periodogram(self) -> None:
         """Change the periodogram."""
         self.bak = ""
-        self.time = np.array(self.time)
-        self.bins = np.array(self.bins)
-        self.z2n = np.zeros(self.bins.size)
-        stats.periodogram(self)
+        if self.search == 'adaptive':
+            stats.adaptive(self, self.peaks)
+        elif self.search == 'reduced':
+            stats.reduced(self, self.peaks)
+        else:
+            self.z2n = np.zeros(self.bins.size)
+            stats.periodogram(self)
         click.secho('Periodogram calculated.', fg='green')
         self.set_gauss()
 
@@ -280,6 +509,46 @@ class Series:
         self.delta = click.prompt(
             "\nFrequency steps (Hz)", self.delta, type=float)
 
+    def get_tolerance(self) -> float:
+        """Return the accuracy of the nufft method."""
+        click.secho(f"Tolerance: {self.tolerance:.1e}", fg='cyan')
+        return self.tolerance
+
+    def set_tolerance(self) -> None:
+        """Change the accuracy of the nufft method."""
+        self.tolerance = click.prompt(
+            "\nTolerance", self.tolerance, type=float)
+
+    def get_binning(self) -> float:
+        """Return the time resolution of the fft method."""
+        click.secho(f"Time resolution: {self.binning:.1e} s", fg='cyan')
+        return self.binning
+
+    def set_binning(self) -> None:
+        """Change the time resolution of the fft method."""
+        self.binning = click.prompt(
+            "\nTime resolution (s)", self.binning, type=float)
+
+    def get_threshold(self) -> float:
+        """Return the power threshold."""
+        click.secho(f"Power threshold: {self.threshold}", fg='cyan')
+        return self.threshold
+
+    def set_threshold(self) -> None:
+        """Change the power threshold."""
+        self.threshold = click.prompt(
+            "\nPower threshold", self.threshold, type=float)
+
+    def get_fap(self) -> float:
+        """Return the false alarm probability."""
+        click.secho(f"False alarm probability: {self.fap}", fg='cyan')
+        return self.fap
+
+    def set_fap(self) -> None:
+        """Change the false alarm probability."""
+        self.fap = click.prompt(
+            "\nFalse alarm probability", self.fap, type=float)
+
     def get_oversample(self) -> int:
         """Return the oversample factor."""
         click.secho(f"Oversampling factor: {self.oversample}", fg='cyan')
@@ -299,6 +568,51 @@ class Series:
         """Change the number of harmonics."""
         self.harmonics = click.prompt("\nNumber of harmonics", 1, type=int)
 
+    def get_workers(self) -> int:
+        """Return the number of worker processes."""
+        click.secho(f"Worker processes: {self.workers}", fg='cyan')
+        return self.workers
+
+    def set_workers(self) -> None:
+        """Change the number of worker processes."""
+        self.workers = click.prompt(
+            "\nNumber of worker processes", self.workers, type=int)
+
+    def get_peaks(self) -> int:
+        """Return the peaks kept by the search."""
+        click.secho(f"Peaks kept: {self.peaks}", fg='cyan')
+        return self.peaks
+
+    def set_peaks(self) -> None:
+        """Change the peaks kept by the search."""
+        self.peaks = click.prompt(
+            "\nNumber of peaks kept", self.peaks, type=int)
+
+    def get_budget(self) -> int:
+        """Return the memory budget."""
+        click.secho(f"Memory budget: {stats.budget(self) * 1e-6:.5f} MB", fg='cyan')
+        return self.budget
+
+    def set_budget(self) -> None:
+        """Change the memory budget."""
+        self.budget = int(click.prompt(
+            "\nMemory budget (MB)", stats.budget(self) * 1e-6, type=float) * 1e6)
+
+    def get_filters(self) -> dict:
+        """Return the filters of the events."""
+        for column, (low, high) in self.filters.items():
+            click.secho(f"Filter: {low} <= {column} <= {high}", fg='cyan')
+        if self.gti:
+            click.secho("Filter: good time intervals", fg='cyan')
+        return self.filters
+
+    def set_filters(self) -> None:
+        """Change the filters of the events."""
+        column = click.prompt("\nFiltered column", 'TIME', type=str)
+        low = click.prompt("Minimum value", float('-inf'), type=float)
+        high = click.prompt("Maximum value", float('inf'), type=float)
+        self.filters[column] = (low, high)
+
     def get_exposure(self) -> float:
         """Return the period of exposure."""
         click.secho(f"Exposure time (Texp): {self.exposure:.1f} s", fg='cyan')
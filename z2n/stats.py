@@ -1,17 +1,37 @@
 #! /usr/bin/python
 # -*- coding: utf-8 -*-
 
+# Generic/Built-in
+import os
+import pathlib
+import tempfile
+import importlib.util
+import multiprocessing
+from multiprocessing import shared_memory
+
 # Other libraries
 import click
 import numpy as np
 from numba import jit
-from tqdm import trange
-from scipy import optimize
-from scipy.stats import norm
-import matplotlib.pyplot as plt
+from numba import prange
+from numba import get_num_threads
+from numba import set_num_threads
+
+# Owned Libraries
+from z2n import lazy
+from z2n.grid import Grid
+from z2n.grid import arange
 
+tqdm = lazy.module('tqdm')
+psutil = lazy.module('psutil')
+fft = lazy.module('scipy.fft')
+signal = lazy.module('scipy.signal')
+optimize = lazy.module('scipy.optimize')
+distributions = lazy.module('scipy.stats')
+plt = lazy.module('matplotlib.pyplot')
 
-@jit(forceobj=True, parallel=True, fastmath=True)
+
+@jit(forceobj=True, parallel=True, fastmath=True, cache=True)
 def exposure(series) -> None:
     """
     Calculate the period of exposure.
@@ -30,7 +50,7 @@ def exposure(series) -> None:
     series.exposure = last - first
 
 
-@jit(forceobj=True, parallel=True, fastmath=True)
+@jit(forceobj=True, parallel=True, fastmath=True, cache=True)
 def sampling(series) -> None:
     """
     Calculate the sampling rate.
@@ -47,7 +67,7 @@ def sampling(series) -> None:
     series.sampling = (1 / series.exposure)
 
 
-@jit(nopython=True, parallel=True, fastmath=True)
+@jit(nopython=True, parallel=True, fastmath=True, cache=True)
 def phase(times: np.array, freq: float, harm: int) -> np.array:
     """
     Calculate the phase values.
@@ -72,7 +92,7 @@ def phase(times: np.array, freq: float, harm: int) -> np.array:
     return values
 
 
-@jit(nopython=True, parallel=True, fastmath=True)
+@jit(nopython=True, parallel=True, fastmath=True, cache=True)
 def sine(phases: np.array) -> np.array:
     """
     Calculate the sine values.
@@ -91,7 +111,7 @@ def sine(phases: np.array) -> np.array:
     return values
 
 
-@jit(nopython=True, parallel=True, fastmath=True)
+@jit(nopython=True, parallel=True, fastmath=True, cache=True)
 def cosine(phases: np.array) -> np.array:
     """
     Calculate the cosine values.
@@ -110,7 +130,7 @@ def cosine(phases: np.array) -> np.array:
     return values
 
 
-@jit(nopython=True, parallel=True, fastmath=True)
+@jit(nopython=True, parallel=True, fastmath=True, cache=True)
 def summation(values: np.array) -> float:
     """
     Calculate the summation value.
@@ -129,7 +149,7 @@ def summation(values: np.array) -> float:
     return value
 
 
-@jit(nopython=True, parallel=False, fastmath=True)
+@jit(nopython=True, parallel=False, fastmath=True, cache=True)
 def square(value: float) -> float:
     """
     Calculate the square values.
@@ -148,7 +168,7 @@ def square(value: float) -> float:
     return value
 
 
-@jit(nopython=True, parallel=False, fastmath=True)
+@jit(nopython=True, parallel=False, fastmath=True, cache=True)
 def summ(sin: float, cos: float) -> float:
     """
     Calculate the Z2n power value.
@@ -169,7 +189,7 @@ def summ(sin: float, cos: float) -> float:
     return value
 
 
-@jit(nopython=True, parallel=False, fastmath=True)
+@jit(nopython=True, parallel=False, fastmath=True, cache=True)
 def z2n(times: np.array, freq: float, harm: int) -> float:
     """
     Calculate the Z2n power value.
@@ -193,7 +213,7 @@ def z2n(times: np.array, freq: float, harm: int) -> float:
     return value
 
 
-@jit(nopython=True, parallel=True, fastmath=True)
+@jit(nopython=True, parallel=True, fastmath=True, cache=True)
 def normalization(spectrum: np.array, normal: float) -> np.array:
     """
     Calculate the normalization values.
@@ -214,57 +234,1448 @@ def normalization(spectrum: np.array, normal: float) -> np.array:
     return values
 
 
-@jit(nopython=True, parallel=True, fastmath=True)
-def harmonics(time: np.array, freq: float, harm: int) -> np.array:
+@jit(nopython=True, parallel=False, fastmath=True, cache=True)
+def accumulate(times: np.array, freq: float, harm: int,
+               sines: np.array, cosines: np.array) -> None:
     """
-    Calculate the Z2n harmonics.
+    Accumulate the sine and cosine sums of the Z2n harmonics.
+
+    The sine and cosine of each arrival time are evaluated once, and the
+    higher harmonics follow from the angle addition of the fundamental,
+    so the cost is close to one transcendental evaluation per event.
 
     Parameters
     ----------
-    series : Series
-        A time series object.
+    times : np.array
+        An array that represents the times.
+    freq : float
+        A float that represents the frequency.
     harm : int
         A int that represents the harmonics.
+    sines : np.array
+        An array that holds the sine sum of each harmonic.
+    cosines : np.array
+        An array that holds the cosine sum of each harmonic.
 
     Returns
     -------
     None
     """
-    values = np.zeros(harm)
+    for time in range(times.size):
+        phi = times[time] * freq
+        phi = (phi - np.floor(phi)) * 2 * np.pi
+        sin = np.sin(phi)
+        cos = np.cos(phi)
+        sink = sin
+        cosk = cos
+        sines[0] += sink
+        cosines[0] += cosk
+        for harmonic in range(1, harm):
+            sink, cosk = sink * cos + cosk * sin, cosk * cos - sink * sin
+            sines[harmonic] += sink
+            cosines[harmonic] += cosk
+
+
+@jit(nopython=True, parallel=False, fastmath=True, cache=True)
+def recurrence(times: np.array, freq: float, harm: int,
+               sines: np.array, cosines: np.array) -> float:
+    """
+    Calculate the Z2n harmonics from the fundamental phase.
+
+    Parameters
+    ----------
+    times : np.array
+        An array that represents the times.
+    freq : float
+        A float that represents the frequency.
+    harm : int
+        A int that represents the harmonics.
+    sines : np.array
+        An array that holds the sine sum of each harmonic.
+    cosines : np.array
+        An array that holds the cosine sum of each harmonic.
+
+    Returns
+    -------
+    value : float
+        A float that represents the Z2n power.
+    """
+    sines[:harm] = 0.0
+    cosines[:harm] = 0.0
+    accumulate(times, freq, harm, sines, cosines)
+    value = 0.0
     for harmonic in range(harm):
-        values[harmonic] = z2n(time, freq, harmonic + 1)
-    value = summation(values)
+        value += sines[harmonic] ** 2 + cosines[harmonic] ** 2
+    return value
+
+
+@jit(nopython=True, parallel=False, fastmath=True, cache=True)
+def harmonics(time: np.array, freq: float, harm: int) -> float:
+    """
+    Calculate the Z2n harmonics.
+
+    Parameters
+    ----------
+    time : np.array
+        An array that represents the times.
+    freq : float
+        A float that represents the frequency.
+    harm : int
+        A int that represents the harmonics.
+
+    Returns
+    -------
+    value : float
+        A float that represents the Z2n power.
+    """
+    return recurrence(time, freq, harm, np.zeros(harm), np.zeros(harm))
+
+
+@jit(nopython=True, parallel=True, fastmath=True, cache=True)
+def spectrum(times: np.array, bins: np.array, harm: int, normal: float,
+             values: np.array, events: int, freqs: int) -> None:
+    """
+    Calculate the Z2n power over a frequency grid.
+
+    The grid is computed in tiles of a block of events against a block
+    of frequencies, so the events of a tile stay in cache while all the
+    frequencies of the block are accumulated.
+
+    Parameters
+    ----------
+    times : np.array
+        An array that represents the times.
+    bins : np.array
+        An array that represents the frequency bins.
+    harm : int
+        A int that represents the harmonics.
+    normal : float
+        A float that represents the normalization.
+    values : np.array
+        An array that receives the Z2n power of each bin.
+    events : int
+        A int that represents the events of each tile.
+    freqs : int
+        A int that represents the frequency bins of each tile.
+
+    Returns
+    -------
+    None
+    """
+    for first in prange((bins.size + freqs - 1) // freqs):
+        low = first * freqs
+        size = min(freqs, bins.size - low)
+        sines = np.zeros((size, harm))
+        cosines = np.zeros((size, harm))
+        for start in range(0, times.size, events):
+            part = times[start:start + events]
+            for freq in range(size):
+                accumulate(part, bins[low + freq], harm,
+                           sines[freq], cosines[freq])
+        for freq in range(size):
+            value = 0.0
+            for harmonic in range(harm):
+                value += sines[freq, harmonic] ** 2 + cosines[freq, harmonic] ** 2
+            values[low + freq] = value * normal
+
+
+def epoch(times: np.array) -> np.array:
+    """
+    Calculate the times since the reference epoch.
+
+    The first arrival time is the reference epoch. The Z2n power does
+    not depend on it, but the products of the phase become smaller.
+
+    Parameters
+    ----------
+    times : np.array
+        An array that represents the times.
+
+    Returns
+    -------
+    values : np.array
+        An array that represents the times since the reference epoch.
+    """
+    values = np.asarray(times, dtype=np.float64) - times[0]
+    return values
+
+
+@jit(nopython=True, parallel=False, fastmath=True, cache=True)
+def sincos(cycles: float) -> tuple:
+    """
+    Calculate the sine and cosine of a phase in single precision.
+
+    The phase is reduced to an octant and evaluated by polynomials,
+    that need only multiplications and can be vectorized.
+
+    Parameters
+    ----------
+    cycles : float
+        A float that represents the phase in cycles, between 0 and 1.
+
+    Returns
+    -------
+    values : tuple
+        A tuple that represents the sine and cosine values.
+    """
+    quadrant = np.floor(cycles * np.float32(4) + np.float32(0.5))
+    angle = (cycles - quadrant * np.float32(0.25)) * np.float32(2 * np.pi)
+    square = angle * angle
+    sin = angle * (np.float32(1) + square * (np.float32(-1 / 6) + square * (
+        np.float32(1 / 120) + square * (np.float32(-1 / 5040)
+                                        + square * np.float32(1 / 362880)))))
+    cos = np.float32(1) + square * (np.float32(-1 / 2) + square * (
+        np.float32(1 / 24) + square * (np.float32(-1 / 720)
+                                       + square * np.float32(1 / 40320))))
+    quadrant = np.int32(quadrant) & 3
+    odd = quadrant & 1
+    sinsign = np.float32(1 - 2 * (quadrant >> 1))
+    cossign = np.float32(1 - 2 * (((quadrant + 1) >> 1) & 1))
+    return (sinsign * (cos if odd else sin), cossign * (sin if odd else cos))
+
+
+@jit(nopython=True, parallel=False,
+     fastmath={'nnan', 'ninf', 'nsz', 'arcp', 'contract', 'afn'}, cache=True)
+def compensated(times: np.array, freq: float, harm: int, sums: np.array,
+                errors: np.array, scratch: np.array) -> None:
+    """
+    Accumulate the sine and cosine sums in single precision.
+
+    The times must be relative to a reference epoch. The phase of each
+    time is reduced in double precision, splitting the time in integer
+    and fractional seconds and the frequency in integer and fractional
+    cycles, so only small products are rounded. The sine and cosine are
+    then evaluated in single precision over blocks of events, and the
+    block sums are accumulated with compensated summation.
+
+    Parameters
+    ----------
+    times : np.array
+        An array that represents the times since the reference epoch.
+    freq : float
+        A float that represents the frequency.
+    harm : int
+        A int that represents the harmonics.
+    sums : np.array
+        An array that holds the sine and cosine sums of each harmonic.
+    errors : np.array
+        An array that holds the compensation of each sum.
+    scratch : np.array
+        An array that holds the sine and cosine values of a block.
+
+    Returns
+    -------
+    None
+    """
+    block = scratch.shape[1]
+    fraction = freq - np.floor(freq)
+    for first in range(0, times.size, block):
+        size = min(block, times.size - first)
+        for time in range(size):
+            seconds = np.floor(times[first + time])
+            phi = seconds * fraction
+            phi = phi - np.floor(phi)
+            phi += (times[first + time] - seconds) * freq
+            sin, cos = sincos(np.float32(phi - np.floor(phi)))
+            scratch[0, time] = sin
+            scratch[1, time] = cos
+            scratch[2, time] = sin
+            scratch[3, time] = cos
+        for harmonic in range(harm):
+            if harmonic:
+                for time in range(size):
+                    scratch[2, time], scratch[3, time] = (
+                        scratch[2, time] * scratch[1, time]
+                        + scratch[3, time] * scratch[0, time],
+                        scratch[3, time] * scratch[1, time]
+                        - scratch[2, time] * scratch[0, time])
+            for index in range(2):
+                part = np.float32(0.0)
+                for time in range(size):
+                    part += scratch[index + 2, time]
+                total = sums[index, harmonic] + part
+                if abs(sums[index, harmonic]) >= abs(part):
+                    errors[index, harmonic] += (
+                        sums[index, harmonic] - total) + part
+                else:
+                    errors[index, harmonic] += (
+                        part - total) + sums[index, harmonic]
+                sums[index, harmonic] = total
+
+
+@jit(nopython=True, parallel=True, fastmath=True, cache=True)
+def single(times: np.array, bins: np.array, harm: int, normal: float,
+           values: np.array, events: int, freqs: int) -> None:
+    """
+    Calculate the Z2n power over a frequency grid in single precision.
+
+    Parameters
+    ----------
+    times : np.array
+        An array that represents the times since the reference epoch.
+    bins : np.array
+        An array that represents the frequency bins.
+    harm : int
+        A int that represents the harmonics.
+    normal : float
+        A float that represents the normalization.
+    values : np.array
+        An array that receives the Z2n power of each bin.
+    events : int
+        A int that represents the events of each tile.
+    freqs : int
+        A int that represents the frequency bins of each tile.
+
+    Returns
+    -------
+    None
+    """
+    for first in prange((bins.size + freqs - 1) // freqs):
+        low = first * freqs
+        size = min(freqs, bins.size - low)
+        sums = np.zeros((size, 2, harm), dtype=np.float32)
+        errors = np.zeros((size, 2, harm), dtype=np.float32)
+        scratch = np.empty((4, 512), dtype=np.float32)
+        for start in range(0, times.size, events):
+            part = times[start:start + events]
+            for freq in range(size):
+                compensated(part, bins[low + freq], harm,
+                            sums[freq], errors[freq], scratch)
+        for freq in range(size):
+            value = 0.0
+            for harmonic in range(harm):
+                for index in range(2):
+                    value += np.float64(
+                        sums[freq, index, harmonic]
+                        + errors[freq, index, harmonic]) ** 2
+            values[low + freq] = value * normal
+
+
+@jit(nopython=True, parallel=True, fastmath=True, cache=True)
+def stepping(times: np.array, bins: np.array, delta: float, harm: int,
+             normal: float, values: np.array) -> None:
+    """
+    Calculate the Z2n power over a uniform frequency grid.
+
+    The phasor of each arrival time is evaluated exactly at the first
+    frequency of a block, and then rotated by the constant phase step
+    of the grid, so only multiplications are needed inside the block.
+    Each block is anchored again with an exact evaluation, which keeps
+    the rounding drift bounded by the block size.
+
+    Parameters
+    ----------
+    times : np.array
+        An array that represents the times.
+    bins : np.array
+        An array that represents the uniform frequency bins.
+    delta : float
+        A float that represents the frequency steps.
+    harm : int
+        A int that represents the harmonics.
+    normal : float
+        A float that represents the normalization.
+    values : np.array
+        An array that receives the Z2n power of each bin.
+
+    Returns
+    -------
+    None
+    """
+    block = 256
+    for first in prange((bins.size + block - 1) // block):
+        low = first * block
+        size = min(block, bins.size - low)
+        sines = np.zeros((size, harm))
+        cosines = np.zeros((size, harm))
+        for time in range(times.size):
+            phi = times[time] * bins[low]
+            phi = (phi - np.floor(phi)) * 2 * np.pi
+            step = times[time] * delta
+            step = (step - np.floor(step)) * 2 * np.pi
+            sin = np.sin(phi)
+            cos = np.cos(phi)
+            sinstep = np.sin(step)
+            cosstep = np.cos(step)
+            for freq in range(size):
+                sink = sin
+                cosk = cos
+                sines[freq, 0] += sink
+                cosines[freq, 0] += cosk
+                for harmonic in range(1, harm):
+                    sink, cosk = sink * cos + cosk * sin, cosk * cos - sink * sin
+                    sines[freq, harmonic] += sink
+                    cosines[freq, harmonic] += cosk
+                sin, cos = sin * cosstep + cos * sinstep, cos * cosstep - sin * sinstep
+        for freq in range(size):
+            value = 0.0
+            for harmonic in range(harm):
+                value += sines[freq, harmonic] ** 2 + cosines[freq, harmonic] ** 2
+            values[low + freq] = value * normal
+
+
+def nufft(times: np.array, fmin: float, delta: float, harm: int,
+          normal: float, values: np.array, tol: float) -> None:
+    """
+    Calculate the Z2n power over a uniform grid with a nonuniform FFT.
+
+    The sine and cosine sums of all frequency bins are obtained at once
+    by a type-1 nonuniform FFT, centered on the middle of the grid, in
+    O(N log N + M) operations for N times and M bins.
+
+    Parameters
+    ----------
+    times : np.array
+        An array that represents the times.
+    fmin : float
+        A float that represents the first frequency bin.
+    delta : float
+        A float that represents the frequency steps.
+    harm : int
+        A int that represents the harmonics.
+    normal : float
+        A float that represents the normalization.
+    values : np.array
+        An array that receives the Z2n power of each bin.
+    tol : float
+        A float that represents the requested relative accuracy.
+
+    Returns
+    -------
+    None
+    """
+    import finufft
+    times = times - times[0]
+    center = fmin + (values.size // 2) * delta
+    values[:] = 0
+    for harmonic in range(1, harm + 1):
+        step = times * (harmonic * delta)
+        step = (step - np.round(step)) * 2 * np.pi
+        phi = times * (harmonic * center)
+        phi = (phi - np.floor(phi)) * 2 * np.pi
+        sums = finufft.nufft1d1(
+            step, np.exp(1j * phi), values.size, eps=tol, isign=1)
+        values += sums.real ** 2 + sums.imag ** 2
+    values *= normal
+
+
+@jit(nopython=True, parallel=False, fastmath=True, cache=True)
+def histogram(times: np.array, first: float, width: float,
+              counts: np.array) -> None:
+    """
+    Calculate the event counts on a uniform time grid.
+
+    Each event is shared by the two nearest points of the grid, with
+    weights that fall linearly with the distance to them.
+
+    Parameters
+    ----------
+    times : np.array
+        An array that represents the times.
+    first : float
+        A float that represents the start of the time grid.
+    width : float
+        A float that represents the width of the time bins.
+    counts : np.array
+        An array that receives the counts of each time bin.
+
+    Returns
+    -------
+    None
+    """
+    for time in range(times.size):
+        position = (times[time] - first) / width
+        index = min(int(position), counts.size - 2)
+        weight = position - index
+        counts[index] += 1 - weight
+        counts[index + 1] += weight
+
+
+def bound(freq: float, harm: int, width: float) -> float:
+    """
+    Calculate the error bound of the binned fft method.
+
+    Each event is shared by the two nearest points of the time grid, so
+    the error of its phasor is below 1 - cos(pi * harm * freq * width),
+    that is second order on the width. The bound is relative to the
+    number of events, that is the largest possible amplitude.
+
+    Parameters
+    ----------
+    freq : float
+        A float that represents the maximum frequency.
+    harm : int
+        A int that represents the harmonics.
+    width : float
+        A float that represents the width of the time bins.
+
+    Returns
+    -------
+    value : float
+        A float that represents the relative amplitude error.
+    """
+    error = np.pi * harm * freq * width
+    correction = np.sinc(harm * freq * width) ** 2
+    value = (1 - np.cos(error)) / correction + (1 / correction - 1)
+    return value
+
+
+def resolution(freq: float, harm: int) -> float:
+    """
+    Calculate the default width of the time bins of the binned fft method.
+
+    Parameters
+    ----------
+    freq : float
+        A float that represents the maximum frequency.
+    harm : int
+        A int that represents the harmonics.
+
+    Returns
+    -------
+    width : float
+        A float that represents the width of the time bins.
+    """
+    return 1 / (32 * harm * freq)
+
+
+def counting(times: np.array, width: float) -> np.array:
+    """
+    Calculate the event counts on a uniform time grid from the first event.
+
+    Parameters
+    ----------
+    times : np.array
+        An array that represents the times.
+    width : float
+        A float that represents the width of the time bins.
+
+    Returns
+    -------
+    counts : np.array
+        An array that represents the counts of each time bin.
+    """
+    first = np.min(times)
+    counts = np.zeros(int((np.max(times) - first) / width) + 2)
+    histogram(times, first, width, counts)
+    return counts
+
+
+def binned(counts: np.array, fmin: float, delta: float, harm: int,
+           normal: float, values: np.array, width: float) -> None:
+    """
+    Calculate the Z2n power over a uniform grid from binned events.
+
+    The events are counted once per run on a uniform time grid, and the
+    chirp-z transform, that is computed with FFTs, maps the counts onto
+    the requested frequency bins. The attenuation caused by the binning
+    is corrected by the squared sinc response of the linear weights.
+
+    Parameters
+    ----------
+    counts : np.array
+        An array that represents the counts of each time bin.
+    fmin : float
+        A float that represents the first frequency bin.
+    delta : float
+        A float that represents the frequency steps.
+    harm : int
+        A int that represents the harmonics.
+    normal : float
+        A float that represents the normalization.
+    values : np.array
+        An array that receives the Z2n power of each bin.
+    width : float
+        A float that represents the width of the time bins.
+
+    Returns
+    -------
+    None
+    """
+    bins = fmin + delta * np.arange(values.size)
+    values[:] = 0
+    for harmonic in range(1, harm + 1):
+        sums = signal.czt(
+            counts, values.size,
+            np.exp(2j * np.pi * harmonic * delta * width),
+            np.exp(-2j * np.pi * harmonic * fmin * width))
+        values += (sums.real ** 2 + sums.imag ** 2) / \
+            np.sinc(harmonic * bins * width) ** 4
+    values *= normal
+
+
+def profitable(events: int, length: int, size: int, chunk: int) -> bool:
+    """
+    Check if the binned fft method is faster than the stepping recurrence.
+
+    Each chunk of the binned fft costs about three FFTs over the time grid
+    and the chunk, and the recurrence costs a few operations for each
+    event and frequency bin. Both grow with the harmonics alike.
+
+    Parameters
+    ----------
+    events : int
+        A int that represents the number of events.
+    length : int
+        A int that represents the number of time bins.
+    size : int
+        A int that represents the number of frequency bins.
+    chunk : int
+        A int that represents the frequency bins per kernel call.
+
+    Returns
+    -------
+    flag : bool
+        A bool that represents if the binned fft is faster.
+    """
+    operations = 0
+    for start in range(0, size, chunk):
+        points = fft.next_fast_len(length + min(chunk, size - start))
+        operations += points * np.log2(points)
+    return 24 * operations < events * size
+
+
+def cache(level: int, default: int) -> int:
+    """
+    Return the size of a data cache level in bytes.
+
+    Parameters
+    ----------
+    level : int
+        A int that represents the cache level.
+    default : int
+        A int that represents the size if it is not available.
+
+    Returns
+    -------
+    value : int
+        A int that represents the cache size.
+    """
+    name = 'SC_LEVEL1_DCACHE_SIZE' if level == 1 else f'SC_LEVEL{level}_CACHE_SIZE'
+    try:
+        value = os.sysconf(name)
+    except (ValueError, OSError, AttributeError):
+        value = 0
+    if value <= 0:
+        path = pathlib.Path('/sys/devices/system/cpu/cpu0/cache')
+        for index in sorted(path.glob('index*')):
+            try:
+                if int((index / 'level').read_text()) == level and \
+                        (index / 'type').read_text().strip() != 'Instruction':
+                    size = (index / 'size').read_text().strip()
+                    units = {'K': 2 ** 10, 'M': 2 ** 20, 'G': 2 ** 30}
+                    value = int(size.rstrip('KMG')) * units.get(size[-1], 1)
+                    break
+            except (ValueError, OSError):
+                pass
+    if value <= 0:
+        value = default
     return value
 
 
-@jit(forceobj=True, parallel=True, fastmath=True)
-def periodogram(series) -> None:
+def tiles(harm: int, size: int) -> tuple:
+    """
+    Calculate the tile sizes of the periodogram kernels.
+
+    A block of events fills half of the L2 cache, and the sums of a
+    block of frequencies fill half of the L1 cache, while there are
+    still enough blocks of frequencies for every thread.
+
+    Parameters
+    ----------
+    harm : int
+        A int that represents the harmonics.
+    size : int
+        A int that represents the number of frequency bins.
+
+    Returns
+    -------
+    values : tuple
+        A tuple that represents the events and frequencies of a tile.
+    """
+    events = max(cache(2, 2 ** 20) // 2 // 8, 1024)
+    freqs = max(cache(1, 2 ** 15) // 2 // (16 * harm), 1)
+    freqs = min(freqs, 256, max(-(-size // get_num_threads()), 1))
+    return events, freqs
+
+
+def uniform(bins: np.array, delta: float) -> bool:
+    """
+    Check if the frequency bins are a uniform grid.
+
+    Parameters
+    ----------
+    bins : np.array
+        An array or a grid that represents the frequency bins.
+    delta : float
+        A float that represents the frequency steps.
+
+    Returns
+    -------
+    flag : bool
+        A bool that represents if the grid is uniform.
+    """
+    if bins.size < 2 or delta <= 0:
+        return False
+    if isinstance(bins, Grid):
+        return bins.step == 1 and bins.delta == delta
+    last = bins[0] + (bins.size - 1) * delta
+    return bool(np.isclose(bins[-1], last, rtol=0, atol=delta * 1e-3))
+
+
+def budget(series) -> int:
+    """
+    Calculate the memory budget of the run.
+
+    Parameters
+    ----------
+    series : Series
+        A time series object.
+
+    Returns
+    -------
+    nbytes : int
+        A int that represents the memory budget in bytes.
+    """
+    if series.budget > 0:
+        return int(series.budget)
+    process = psutil.Process().memory_info().rss
+    return int(psutil.virtual_memory().available + process)
+
+
+def kernel(series, method: str, chunk: int) -> int:
+    """
+    Estimate the temporary memory of a kernel call.
+
+    Parameters
+    ----------
+    series : Series
+        A time series object.
+    method : str
+        A string that represents the method of the periodogram.
+    chunk : int
+        A int that represents the frequency bins per kernel call.
+
+    Returns
+    -------
+    nbytes : int
+        A int that represents the temporary memory in bytes.
+    """
+    events = series.time.size
+    harm = max(series.harmonics, 1)
+    if method == 'nufft':
+        return 48 * events + 64 * chunk
+    if method == 'fft':
+        width = series.binning
+        if width <= 0:
+            top = series.fmax
+            if top <= 0:
+                top = series.bins[-1] if series.bins.size else 1
+            width = resolution(top, harm)
+        length = int(series.exposure / width) + 2
+        return 8 * length + 48 * fft.next_fast_len(length + chunk) + 24 * chunk
+    if method == 'direct' and series.precision == 'single':
+        return 8 * events + 16 * harm * chunk
+    return 16 * harm * chunk
+
+
+def cost(series, chunk: int = 2 ** 14, total: int = 0) -> dict:
+    """
+    Estimate the peak memory of the periodogram.
+
+    The peak is reached either by the kernel calls or by the copies made
+    when the periodogram is saved, on top of the times, the frequency
+    bins and the periodogram kept during the whole run.
+
+    Parameters
+    ----------
+    series : Series
+        A time series object.
+    chunk : int
+        A int that represents the frequency bins per kernel call.
+    total : int
+        A int that represents the number of steps, those of the series if 0.
+
+    Returns
+    -------
+    usage : dict
+        A dict that represents the memory of each part in bytes.
+    """
+    total = total if total else steps(series)
+    method = series.method
+    if method in ('nufft', 'fft'):
+        chunk = max(chunk, 2 ** 22)
+    chunk = min(chunk, max(total, 1))
+    if series.stream or series.search == 'reduced':
+        spectrum = 16 * (chunk + 2 * series.peaks)
+        output = 0
+    elif series.search == 'adaptive':
+        coarse = max(int((series.fmax - series.fmin) * series.harmonics
+                         * series.exposure), 0)
+        window = 4 / (series.harmonics * series.exposure * series.delta)
+        spectrum = 16 * (coarse + series.peaks * max(int(window), 1))
+        output = 2 * spectrum
+    else:
+        spectrum = 8 * total
+        output = 32 * total
+    usage = {
+        'events': 8 * series.time.size,
+        'periodogram': spectrum,
+        'kernel': kernel(series, method, chunk),
+        'workers': 0,
+        'output': output,
+    }
+    if series.workers > 1:
+        usage['workers'] = series.workers * (
+            2 ** 28 + kernel(series, method, chunk)) + usage['events'] + spectrum
+    usage['peak'] = usage['events'] + spectrum + max(
+        usage['kernel'] + usage['workers'], output)
+    return usage
+
+
+def fitting(series, method: str, chunk: int, total: int = 0) -> int:
+    """
+    Select the largest chunk whose kernel calls fit the memory budget.
+
+    Parameters
+    ----------
+    series : Series
+        A time series object.
+    method : str
+        A string that represents the method of the periodogram.
+    chunk : int
+        A int that represents the frequency bins per kernel call.
+    total : int
+        A int that represents the number of steps, those of the series if 0.
+
+    Returns
+    -------
+    chunk : int
+        A int that represents the frequency bins per kernel call.
+    """
+    usage = cost(series, chunk, total)
+    limit = budget(series) - usage['events'] - usage['periodogram']
+    workers = max(series.workers, 1)
+    minimum = 2 ** 14 if method in ('nufft', 'fft') else 2 ** 8
+    while chunk > minimum and workers * kernel(series, method, chunk) > limit:
+        chunk //= 2
+    return chunk
+
+
+def options(series, chunk: int = 2 ** 14, bins: np.array = None) -> dict:
+    """
+    Select the method and the parameters of the periodogram.
+
+    Parameters
+    ----------
+    series : Series
+        A time series object.
+    chunk : int
+        A int that represents the frequency bins per kernel call.
+    bins : np.array
+        An array or a grid that represents the frequency bins of the run,
+        those of the series if None.
+
+    Returns
+    -------
+    option : dict
+        A dict that represents the parameters of the kernels.
+    """
+    bins = series.bins if bins is None else bins
+    method = series.method
+    if method in ('stepping', 'nufft', 'fft') and not uniform(bins, series.delta):
+        click.secho("Frequency bins are not uniform, using direct.", fg='yellow')
+        method = 'direct'
+    if method == 'nufft':
+        if importlib.util.find_spec('finufft') is None:
+            click.secho("Failed to use the nufft method.", fg='red')
+            click.secho(
+                "Check finufft dependency: pip install finufft", fg='yellow')
+            method = 'direct'
+        else:
+            chunk = max(chunk, 2 ** 22)
+    width = series.binning
+    if method == 'fft':
+        if width <= 0:
+            width = resolution(bins[-1], series.harmonics)
+        length = int(np.ptp(series.time) / width) + 2
+        if not profitable(series.time.size, length, bins.size,
+                          max(chunk, 2 ** 22)):
+            click.secho(
+                "Binned fft is slower than stepping, using stepping.", fg='yellow')
+            method = 'stepping'
+    if method == 'fft':
+        error = bound(bins[-1], series.harmonics, width)
+        click.secho(f"Time resolution: {width:.1e} s", fg='cyan')
+        click.secho(f"Error bound: {error:.1e} of the amplitude", fg='cyan')
+        if error > 1e-2:
+            click.secho(
+                "Error bound above the tolerance of 1e-2, "
+                "decrease the binning for accurate powers.", fg='yellow')
+        chunk = max(chunk, 2 ** 22)
+    size = fitting(series, method, chunk, bins.size)
+    if size < min(chunk, bins.size):
+        click.secho(
+            f"Chunks of {size} steps to fit the memory budget.", fg='yellow')
+    chunk = size
+    precision = series.precision
+    if precision == 'single' and method != 'direct':
+        click.secho(
+            "Single precision is only used by direct method.", fg='yellow')
+        precision = 'double'
+    events, freqs = tiles(series.harmonics, min(chunk, bins.size))
+    option = {
+        'method': method,
+        'precision': precision,
+        'harmonics': series.harmonics,
+        'normal': 2 / series.time.size,
+        'delta': series.delta,
+        'tolerance': series.tolerance,
+        'width': width,
+        'chunk': chunk,
+        'events': events,
+        'freqs': freqs,
+    }
+    if method == 'fft':
+        option['counts'] = counting(series.time, width)
+    return option
+
+
+def compute(times: np.array, bins: np.array, values: np.array,
+            option: dict) -> None:
+    """
+    Calculate the Z2n power of a chunk of frequency bins.
+
+    Parameters
+    ----------
+    times : np.array
+        An array that represents the times, since the reference epoch
+        on single precision.
+    bins : np.array
+        An array that represents the frequency bins.
+    values : np.array
+        An array that receives the Z2n power of each bin.
+    option : dict
+        A dict that represents the parameters of the kernels.
+
+    Returns
+    -------
+    None
+    """
+    harm = option['harmonics']
+    normal = option['normal']
+    if option['method'] in ('direct', 'stepping'):
+        bins = np.asarray(bins)
+    if option['method'] == 'nufft':
+        nufft(times, bins[0], option['delta'], harm, normal, values,
+              option['tolerance'])
+    elif option['method'] == 'fft':
+        binned(option['counts'], bins[0], option['delta'], harm, normal, values,
+               option['width'])
+    elif option['method'] == 'stepping':
+        stepping(times, bins, option['delta'], harm, normal, values)
+    elif option['precision'] == 'single':
+        single(times, bins, harm, normal, values,
+               option['events'], option['freqs'])
+    else:
+        spectrum(times, bins, harm, normal, values,
+                 option['events'], option['freqs'])
+
+
+def shard(task: tuple) -> tuple:
+    """
+    Calculate the Z2n power of a shard on a worker process.
+
+    The times and the frequency bins are attached from shared memory, and
+    the periodogram is mapped from its shared file, so nothing but their
+    names is sent to the worker, that writes its bins in place.
+
+    Parameters
+    ----------
+    task : tuple
+        A tuple with the shared memory names and sizes, the path of the
+        periodogram, the first and last bins of the shard, the parameters
+        of the kernels and the frequency grid, if the bins are not in
+        shared memory. The event counts of the fft method follow the
+        times in shared memory.
+
+    Returns
+    -------
+    bounds : tuple
+        A tuple that represents the first and last bins calculated.
+    """
+    names, sizes, path, total, start, stop, option, grid = task
+    set_num_threads(1)
+    option = dict(option)
+    option['events'], option['freqs'] = tiles(option['harmonics'], stop - start)
+    values = np.memmap(path, dtype=np.float64, mode='r+', shape=(total,))
+    memory = [shared_memory.SharedMemory(name=name) for name in names]
+    try:
+        times, *arrays = (
+            np.ndarray(size, dtype=np.float64, buffer=block.buf)
+            for block, size in zip(memory, sizes))
+        if option['method'] == 'fft':
+            option['counts'] = arrays.pop(0)
+        bins = grid if grid is not None else arrays[0]
+        for first in range(start, stop, option['chunk']):
+            last = min(first + option['chunk'], stop)
+            compute(times, bins[first:last], values[first:last], option)
+        del times, bins, arrays, option
+    finally:
+        for block in memory:
+            block.close()
+    del values
+    return start, stop
+
+
+def processes(series, times: np.array, option: dict, done: np.array) -> None:
+    """
+    Calculate the Z2n statistics on a pool of worker processes.
+
+    The frequency bins are split in shards over the workers, and the
+    times, with the event counts of the fft method, are placed in shared
+    memory. The periodogram of the series is replaced by a map of a
+    shared file, where the workers write their bins in place, so it is
+    never copied back.
+
+    Parameters
+    ----------
+    series : Series
+        A time series object.
+    times : np.array
+        An array that represents the times.
+    option : dict
+        A dict that represents the parameters of the kernels.
+    done : np.array
+        An array that represents the sorted and merged ranges calculated.
+
+    Returns
+    -------
+    None
+    """
+    grid = series.bins if isinstance(series.bins, Grid) else None
+    option = dict(option)
+    arrays = [times]
+    if 'counts' in option:
+        arrays.append(option.pop('counts'))
+    if grid is None:
+        arrays.append(np.asarray(series.bins))
+    total = series.bins.size
+    folder = '/dev/shm' if os.path.isdir('/dev/shm') else None
+    with tempfile.NamedTemporaryFile(
+            suffix='.z2n', dir=folder, delete=False) as handle:
+        path = handle.name
+    memory = [shared_memory.SharedMemory(
+        create=True, size=max(array.size, 1) * 8) for array in arrays]
+    try:
+        values = np.memmap(path, dtype=np.float64, mode='w+', shape=(total,))
+        if done.size:
+            values[:] = series.z2n
+        series.z2n = values
+        for block, array in zip(memory, arrays):
+            np.ndarray(array.size, dtype=np.float64, buffer=block.buf)[:] = array
+        names = [block.name for block in memory]
+        sizes = [array.size for array in arrays]
+        size = -(-total // (4 * series.workers))
+        size = -(-size // option['chunk']) * option['chunk']
+        tasks = [(names, sizes, path, total, start, min(start + size, total),
+                  option, grid) for start in range(0, total, size)
+                 if not covered(done, start, min(start + size, total))]
+        context = multiprocessing.get_context('spawn')
+        with context.Pool(series.workers) as pool, tqdm.tqdm(
+                total=total, desc=click.style(
+                    'Calculating the periodogram', fg='yellow')) as progress:
+            progress.update(total - sum(task[5] - task[4] for task in tasks))
+            for start, stop in pool.imap_unordered(shard, tasks):
+                progress.update(stop - start)
+                done = checkpoint(series, start, stop, done)
+    finally:
+        for block in memory:
+            block.close()
+            block.unlink()
+        os.remove(path)
+
+
+def merge(ranges: np.array) -> np.array:
+    """
+    Sort and merge the overlapping or adjacent ranges of bins.
+
+    Parameters
+    ----------
+    ranges : np.array
+        An array that represents the first and past the last bin of each range.
+
+    Returns
+    -------
+    done : np.array
+        An array that represents the sorted and merged ranges.
+    """
+    merged = []
+    for first, last in ranges[np.argsort(ranges[:, 0], kind='stable')]:
+        if merged and first <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], last)
+        else:
+            merged.append([first, last])
+    return np.array(merged, dtype=np.int64).reshape(-1, 2)
+
+
+def covered(done: np.array, start: int, stop: int) -> bool:
+    """
+    Check if a range of frequency bins was already calculated.
+
+    Parameters
+    ----------
+    done : np.array
+        An array that represents the sorted and merged ranges calculated.
+    start : int
+        A int that represents the first bin of the range.
+    stop : int
+        A int that represents the bin past the last one of the range.
+
+    Returns
+    -------
+    flag : bool
+        A bool that represents if the whole range was calculated.
+    """
+    index = np.searchsorted(done[:, 0], start, side='right') - 1
+    return bool(index >= 0 and done[index, 1] >= stop)
+
+
+def restore(series) -> np.array:
+    """
+    Restore the bins already calculated from the checkpoint.
+
+    The checkpoint keeps the ranges of frequency bins calculated, so it
+    does not depend on the chunks of the kernel calls.
+
+    Parameters
+    ----------
+    series : Series
+        A time series object.
+
+    Returns
+    -------
+    done : np.array
+        An array that represents the sorted and merged ranges calculated.
+    """
+    done = np.empty((0, 2), dtype=np.int64)
+    if not series.checkpoint:
+        return done
+    hdf = series.checkpoint
+    if 'Z2N' not in hdf or 'DONE' not in hdf or (
+            hdf['Z2N'].shape != (series.bins.size,)) or hdf['DONE'].ndim != 2:
+        for key in ('Z2N', 'DONE'):
+            if key in hdf:
+                del hdf[key]
+        hdf.create_dataset('Z2N', shape=(series.bins.size,), dtype=np.float64)
+        hdf.create_dataset(
+            'DONE', shape=(0, 2), maxshape=(None, 2), dtype=np.int64)
+        hdf.flush()
+        return done
+    done = merge(hdf['DONE'][:])
+    if done.size:
+        series.z2n[:] = hdf['Z2N'][:]
+        click.secho(
+            f"Resuming with {int(np.sum(done[:, 1] - done[:, 0]))} of "
+            f"{series.bins.size} steps.", fg='yellow')
+    return done
+
+
+def checkpoint(series, start: int, stop: int, done: np.array) -> np.array:
+    """
+    Save the calculated bins on the checkpoint.
+
+    Parameters
+    ----------
+    series : Series
+        A time series object.
+    start : int
+        A int that represents the first bin calculated.
+    stop : int
+        A int that represents the bin past the last one calculated.
+    done : np.array
+        An array that represents the sorted and merged ranges calculated.
+
+    Returns
+    -------
+    done : np.array
+        An array that represents the sorted and merged ranges calculated.
+    """
+    if series.checkpoint:
+        series.checkpoint['Z2N'][start:stop] = series.z2n[start:stop]
+        ranges = series.checkpoint['DONE']
+        ranges.resize(ranges.shape[0] + 1, axis=0)
+        ranges[-1] = (start, stop)
+        series.checkpoint.flush()
+    return merge(np.vstack((done, [[start, stop]])))
+
+
+def periodogram(series, chunk: int = 2 ** 14) -> None:
     """
     Calculate the Z2n statistics.
 
+    The chunks are saved on the checkpoint of the series, if any, as they
+    finish, and the chunks found there are not calculated again.
+
     Parameters
     ----------
     series : Series
         A time series object.
+    chunk : int
+        A int that represents the frequency bins per kernel call.
 
     Returns
     -------
     None
     """
-    if series.harmonics == 1:
-        for freq in trange(series.bins.size, desc=click.style(
-                'Calculating the periodogram', fg='yellow')):
-            series.z2n[freq] = z2n(
-                series.time, series.bins[freq], series.harmonics)
+    option = options(series, chunk)
+    times = series.time
+    if option['precision'] == 'single':
+        times = epoch(series.time)
+    done = restore(series)
+    if series.workers > 1 and series.bins.size:
+        processes(series, times, option, done)
     else:
-        for freq in trange(series.bins.size, desc=click.style(
-                'Calculating the periodogram', fg='yellow')):
-            series.z2n[freq] = harmonics(
-                series.time, series.bins[freq], series.harmonics)
-    series.z2n = normalization(series.z2n, (2 / series.time.size))
+        for start in tqdm.trange(0, series.bins.size, option['chunk'],
+                                 desc=click.style(
+                                     'Calculating the periodogram', fg='yellow')):
+            stop = min(start + option['chunk'], series.bins.size)
+            if covered(done, start, stop):
+                continue
+            compute(times, series.bins[start:stop],
+                    series.z2n[start:stop], option)
+            done = checkpoint(series, start, stop, done)
+    if series.checkpoint:
+        path = series.checkpoint.filename
+        series.checkpoint.close()
+        series.checkpoint = ""
+        os.remove(path)
+
+
+def steps(series) -> int:
+    """
+    Calculate the number of steps of the frequency bins.
+
+    Before the frequency bins are set, the steps are those of the grid from
+    the minimum to the maximum frequency.
+
+    Parameters
+    ----------
+    series : Series
+        A time series object.
+
+    Returns
+    -------
+    total : int
+        A int that represents the number of steps.
+    """
+    if series.bins.size:
+        return series.bins.size
+    return arange(series.fmin, series.fmax, series.delta).size
+
+
+def candidates(bins: np.array, values: np.array, peaks: int) -> np.array:
+    """
+    Select the frequencies of the highest local maxima.
+
+    Parameters
+    ----------
+    bins : np.array
+        An array that represents the frequency bins.
+    values : np.array
+        An array that represents the Z2n power of the bins.
+    peaks : int
+        A int that represents the number of candidates.
+
+    Returns
+    -------
+    centers : np.array
+        An array that represents the frequencies of the candidates.
+    """
+    left = np.r_[True, values[1:] >= values[:-1]]
+    right = np.r_[values[:-1] >= values[1:], True]
+    index = np.flatnonzero(left & right)
+    index = index[np.argsort(values[index], kind='stable')[::-1][:peaks]]
+    return bins[index]
+
+
+def windows(series, centers: np.array, radius: float) -> tuple:
+    """
+    Merge the neighborhoods of the candidates on the target grid.
 
+    Parameters
+    ----------
+    series : Series
+        A time series object.
+    centers : np.array
+        An array that represents the frequencies of the candidates.
+    radius : float
+        A float that represents the half width of the neighborhoods (Hz).
+
+    Returns
+    -------
+    lower, upper : tuple
+        Arrays that represent the first and past the last step of each window.
+    """
+    total = arange(series.fmin, series.fmax, series.delta).size
+    lower = np.ceil((np.sort(centers) - radius - series.fmin) / series.delta)
+    upper = np.floor((np.sort(centers) + radius - series.fmin) / series.delta) + 1
+    lower = np.clip(lower, 0, total).astype(np.int64)
+    upper = np.clip(upper, 0, total).astype(np.int64)
+    merged = []
+    for first, last in zip(lower, upper):
+        if last <= first:
+            continue
+        if merged and first <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], last)
+        else:
+            merged.append([first, last])
+    merged = np.array(merged, dtype=np.int64).reshape(-1, 2)
+    return merged[:, 0], merged[:, 1]
+
+
+def adaptive(series, peaks: int = 10, radius: float = 2) -> None:
+    """
+    Calculate the Z2n statistics with a coarse to fine search.
+
+    The band is scanned at one step per harmonic resolution, 1 / (n T), and
+    only the neighborhoods of the highest local maxima are calculated on the
+    target grid. The resulting bins are not uniform.
+
+    Parameters
+    ----------
+    series : Series
+        A time series object.
+    peaks : int
+        A int that represents the number of candidates refined.
+    radius : float
+        A float that represents the half width of the neighborhoods in coarse steps.
 
-@jit(forceobj=True, parallel=True, fastmath=True)
+    Returns
+    -------
+    None
+    """
+    delta = series.delta
+    coarse = 1 / (series.harmonics * series.exposure)
+    if coarse <= 2 * delta:
+        series.bins = arange(series.fmin, series.fmax, delta)
+        series.z2n = np.zeros(series.bins.size)
+        periodogram(series)
+        return
+    series.bins = np.arange(series.fmin, series.fmax, coarse)
+    series.z2n = np.zeros(series.bins.size)
+    series.delta = coarse
+    periodogram(series)
+    series.delta = delta
+    lower, upper = windows(
+        series, candidates(series.bins, series.z2n, peaks), radius * coarse)
+    if not lower.size:
+        return
+    grids = [series.fmin + delta * np.arange(first, last)
+             for first, last in zip(lower, upper)]
+    values = [np.zeros(grid.size) for grid in grids]
+    click.secho(
+        f"Refining {len(grids)} windows with "
+        f"{int(np.sum(upper - lower))} steps.", fg='cyan')
+    bins, z2n = series.bins, series.z2n
+    option = options(series, bins=grids[-1])
+    times = series.time
+    if option['precision'] == 'single':
+        times = epoch(series.time)
+    for grid, value in zip(tqdm.tqdm(grids, desc=click.style(
+            'Refining the periodogram', fg='yellow')), values):
+        for start in range(0, grid.size, option['chunk']):
+            stop = min(start + option['chunk'], grid.size)
+            compute(times, grid[start:stop], value[start:stop], option)
+    first = series.fmin + delta * lower
+    last = series.fmin + delta * (upper - 1)
+    index = np.searchsorted(first, bins, side='right') - 1
+    inside = (index >= 0) & (bins <= last[np.maximum(index, 0)])
+    bins = np.concatenate([bins[~inside]] + grids)
+    z2n = np.concatenate([z2n[~inside]] + values)
+    order = np.argsort(bins, kind='stable')
+    series.bins = bins[order]
+    series.z2n = z2n[order]
+
+
+def significance(series, total: int) -> float:
+    """
+    Calculate the power threshold of the reduced search.
+
+    Parameters
+    ----------
+    series : Series
+        A time series object.
+    total : int
+        A int that represents the number of trials.
+
+    Returns
+    -------
+    level : float
+        A float that represents the power threshold.
+    """
+    level = series.threshold
+    if 0 < series.fap < 1 and total > 0:
+        trial = -np.expm1(np.log1p(-series.fap) / total)
+        level = max(level, distributions.chi2.isf(trial, 2 * series.harmonics))
+    return level
+
+
+def reduced(series, peaks: int = 10, chunk: int = 2 ** 14,
+            stream=None) -> None:
+    """
+    Calculate the Z2n statistics keeping only the highest peaks.
+
+    The frequency bins are generated chunk by chunk and only the highest
+    peaks, and the bins above the power threshold, are kept on the series.
+    Each chunk is also handed to the stream, if any, as it finishes.
+
+    Parameters
+    ----------
+    series : Series
+        A time series object.
+    peaks : int
+        A int that represents the number of peaks kept.
+    chunk : int
+        A int that represents the frequency bins per kernel call.
+    stream : callable
+        A function that receives the frequency bins and power of each chunk.
+
+    Returns
+    -------
+    None
+    """
+    grid = arange(series.fmin, series.fmax, series.delta)
+    total = grid.size
+    level = significance(series, total)
+    if level > 0:
+        click.secho(f"Power threshold: {level:.5f}", fg='cyan')
+    option = options(series, chunk, grid)
+    times = series.time
+    if option['precision'] == 'single':
+        times = epoch(series.time)
+    bins, z2n = np.array([]), np.array([])
+    values = np.zeros(min(option['chunk'], total))
+    for start in tqdm.trange(0, total, option['chunk'],
+                             desc=click.style(
+                                 'Calculating the periodogram', fg='yellow')):
+        stop = min(start + option['chunk'], total)
+        block = np.asarray(grid[start:stop])
+        compute(times, block, values[:block.size], option)
+        if stream is not None:
+            stream(block, values[:block.size])
+        bins = np.concatenate((bins, block))
+        z2n = np.concatenate((z2n, values[:block.size]))
+        keep = z2n >= level if level > 0 else np.zeros(z2n.size, dtype=bool)
+        if peaks > 0:
+            keep[np.argpartition(z2n, -min(peaks, z2n.size))[-peaks:]] = True
+        bins, z2n = bins[keep], z2n[keep]
+    order = np.argsort(bins, kind='stable')
+    series.bins = bins[order]
+    series.z2n = z2n[order]
+
+
+@jit(forceobj=True, parallel=True, fastmath=True, cache=True)
 def power(series) -> None:
     """
     Calculate the global power.
@@ -281,7 +1692,7 @@ def power(series) -> None:
     series.power = np.max(series.z2n)
 
 
-@jit(forceobj=True, parallel=True, fastmath=True)
+@jit(forceobj=True, parallel=True, fastmath=True, cache=True)
 def frequency(series) -> None:
     """
     Calculate the global frequency.
@@ -299,7 +1710,7 @@ def frequency(series) -> None:
     series.frequency = series.bins[index]
 
 
-@jit(forceobj=True, parallel=True, fastmath=True)
+@jit(forceobj=True, parallel=True, fastmath=True, cache=True)
 def period(series) -> None:
     """
     Calculate the global period.
@@ -316,7 +1727,7 @@ def period(series) -> None:
     series.period = 1 / series.frequency
 
 
-@jit(forceobj=True, parallel=True, fastmath=True)
+@jit(forceobj=True, parallel=True, fastmath=True, cache=True)
 def pfraction(series) -> None:
     """
     Calculate the pulsed fraction.
@@ -334,19 +1745,19 @@ def pfraction(series) -> None:
     series.pulsed = pfrac ** 0.5
 
 
-@jit(nopython=True, parallel=True, fastmath=True)
+@jit(nopython=True, parallel=True, fastmath=True, cache=True)
 def gaussian(x, amplitude, mean, sigma):
     """Returns a Gaussian like function."""
     return amplitude * np.exp(-((x - mean) ** 2) / (2 * sigma ** 2))
 
 
-@jit(forceobj=True, parallel=True, fastmath=True)
+@jit(forceobj=True, parallel=True, fastmath=True, cache=True)
 def fitcurve(function, bins, powerspec, guess):
     """Fit a input curve function to the data."""
     return optimize.curve_fit(function, bins, powerspec, guess)
 
 
-@jit(forceobj=True, parallel=True, fastmath=True)
+@jit(forceobj=True, parallel=True, fastmath=True, cache=True)
 def equal(A, B, tol=1e-05):
     """Compare floating point numbers with tolerance."""
     S = round(1/tol)
@@ -377,9 +1788,9 @@ def error(series) -> None:
                 up = np.where(equal(series.bins, axis[1]))[0][-1]
                 bins = series.bins
                 powerspec = series.z2n
-                series.bins = series.bins[low:up]
+                series.bins = np.asarray(series.bins[low:up])
                 series.z2n = series.z2n[low:up]
-                mean, sigma = norm.fit(series.bins)
+                mean, sigma = distributions.norm.fit(series.bins)
                 power(series)
                 frequency(series)
                 period(series)